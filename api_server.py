@@ -0,0 +1,178 @@
+"""
+A small JSON API for tier lists that does not go through Streamlit.
+
+    python api_server.py --port 8502
+
+    GET /tier-list?preset=Solo: No Rush      a preset (by name or file name, e.g. solo-no-rush)
+    GET /tier-list?villain=Klaw               a villain's weighting
+    GET /tier-list?w=VuBku1WitwUC             a weighting in the dashboard's URL encoding
+    GET /tier-list?weighting=4,2,2,...        a weighting as 15 comma-separated integers
+    GET /presets, GET /villains               the available names
+
+Tier lists use the stock hero stats and the same scoring and tiering code as
+the dashboard. Response bodies are cached per weighting and carry an ETag, so
+clients that send If-None-Match get an empty 304 back. HEAD is answered
+with the same headers as GET and no body.
+"""
+import argparse
+import hashlib
+import json
+import re
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from preset_options import preset_options
+from scoring import HERO_NAMES, HERO_MATRIX, score_heroes
+from stat_schema import N_STATS, WEIGHT_RANGE
+from tiers import assign_tiers, tier_list_record
+from url_state import decode_weighting
+from villain_weights import villain_weights
+
+MAX_AGE = 300   # seconds clients may reuse a response without revalidating
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _key(name):
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def _lookup(table, name, what):
+    """Find `name` in a {name: weighting} table by exact name or file name."""
+    if name in table:
+        return name
+    matches = [candidate for candidate in table if _key(candidate) == _key(name)]
+    if not matches:
+        raise ApiError(404, f"Unknown {what}: {name}")
+    return matches[0]
+
+
+def _parse_weighting(text):
+    try:
+        values = [int(value) for value in text.split(",")]
+    except ValueError:
+        raise ApiError(400, "weighting must be comma-separated integers") from None
+    if len(values) != N_STATS or not all(WEIGHT_RANGE[0] <= value <= WEIGHT_RANGE[1] for value in values):
+        raise ApiError(400, f"weighting must be {N_STATS} integers from {WEIGHT_RANGE[0]} to {WEIGHT_RANGE[1]}")
+    return tuple(values)
+
+
+@lru_cache(maxsize=4096)
+def tier_list_response(weighting, name=None):
+    """(JSON body, ETag) for a weighting tuple, cached per weighting and name."""
+    tier_list = assign_tiers(score_heroes(HERO_MATRIX, np.array(weighting)))
+    body = json.dumps({"name": name, "weighting": list(weighting), **tier_list_record(tier_list, HERO_NAMES)}).encode()
+    return body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def _json_response(data):
+    body = json.dumps(data).encode()
+    return body, f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+NAME_RESPONSES = {
+    "/presets": _json_response(list(preset_options)),
+    "/villains": _json_response(list(villain_weights)),
+}
+
+
+def resolve(path, query):
+    """(body, ETag) for a request path and parsed query, or raise ApiError."""
+    if path in NAME_RESPONSES:
+        return NAME_RESPONSES[path]
+    if path != "/tier-list":
+        raise ApiError(404, f"No such endpoint: {path}")
+    if "preset" in query:
+        name = _lookup(preset_options, query["preset"][0], "preset")
+        return tier_list_response(tuple(int(v) for v in preset_options[name]), name)
+    if "villain" in query:
+        name = _lookup(villain_weights, query["villain"][0], "villain")
+        return tier_list_response(tuple(int(v) for v in villain_weights[name]), name)
+    if "w" in query:
+        try:
+            return tier_list_response(tuple(decode_weighting(query["w"][0]).tolist()))
+        except ValueError as error:
+            raise ApiError(400, str(error)) from None
+    if "weighting" in query:
+        return tier_list_response(_parse_weighting(query["weighting"][0]))
+    raise ApiError(400, "Pass one of preset, villain, w or weighting")
+
+
+def etag_matches(if_none_match, etag):
+    """The If-None-Match check: weak comparison against a comma-separated list of tags, or *."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+class TierListHandler(BaseHTTPRequestHandler):
+    # Keep-alive connections, so clients do not pay a TCP handshake per request.
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; without this, Nagle's algorithm
+    # holds the body back for the client's delayed ACK (~40 ms per request).
+    disable_nagle_algorithm = True
+    server_version = "TierListAPI/1.0"
+    quiet = True
+
+    def do_GET(self):
+        self._respond(include_body=True)
+
+    def do_HEAD(self):
+        self._respond(include_body=False)
+
+    def _respond(self, include_body):
+        url = urlsplit(self.path)
+        try:
+            body, etag = resolve(url.path.rstrip("/") or "/", parse_qs(url.query))
+        except ApiError as error:
+            self._send(error.status, json.dumps({"error": str(error)}).encode(), include_body=include_body)
+            return
+        if etag_matches(self.headers.get("If-None-Match"), etag):
+            self._send(304, b"", etag)
+        else:
+            self._send(200, body, etag, include_body)
+
+    def _send(self, status, body, etag=None, include_body=True):
+        self.send_response(status)
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", f"public, max-age={MAX_AGE}")
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def serve(host="127.0.0.1", port=8502, quiet=True):
+    # Warm the cache with every preset and villain before accepting requests.
+    for name, weighting in {**preset_options, **villain_weights}.items():
+        tier_list_response(tuple(int(v) for v in weighting), name)
+    TierListHandler.quiet = quiet
+    server = ThreadingHTTPServer((host, port), TierListHandler)
+    server.daemon_threads = True
+    print(f"Serving tier lists on http://{host}:{port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve tier lists as JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args()
+    serve(args.host, args.port, quiet=not args.verbose)
@@ -0,0 +1,84 @@
+"""
+Cold-start import check for the dashboard and its pages.
+
+Runs the top-level imports of every app script in a fresh interpreter under
+`python -X importtime` and reports the slowest packages. Exits non-zero if
+the imports take longer than the startup budget, or if a heavy package that
+should only load on demand (matplotlib, PIL, pandas, altair) is imported at
+startup.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget 1.5 --top 15
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_SCRIPTS = ["dashboard_hero_tier_list.py"] + sorted(
+    os.path.join("pages", name) for name in os.listdir(os.path.join(ROOT, "pages")) if name.endswith(".py")
+)
+# Only the sections that draw charts or images need these.
+LAZY_PACKAGES = ("matplotlib", "PIL", "pandas", "altair")
+STARTUP_BUDGET_SECONDS = 1.0
+
+
+def top_level_imports(paths):
+    """The module-level import statements of the given scripts, as source code."""
+    lines = []
+    for path in paths:
+        with open(os.path.join(ROOT, path)) as f:
+            tree = ast.parse(f.read(), path)
+        lines += [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(dict.fromkeys(lines))
+
+
+def import_times(code):
+    """{top-level package: cumulative seconds} for running `code` in a fresh interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # importtime indents nested imports by two spaces per level.
+        if not name.startswith("   "):
+            package = name.strip().split(".")[0]
+            times[package] = times.get(package, 0) + int(cumulative) / 1e6
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the dashboard's cold-start imports.")
+    parser.add_argument("--budget", type=float, default=STARTUP_BUDGET_SECONDS, help="seconds allowed for all imports")
+    parser.add_argument("--top", type=int, default=10, help="how many of the slowest packages to list")
+    args = parser.parse_args(argv)
+
+    times = import_times(top_level_imports(APP_SCRIPTS))
+    total = sum(times.values())
+    for package, seconds in sorted(times.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{package:<28} {seconds * 1000:9.1f} ms")
+    print(f"{'total':<28} {total * 1000:9.1f} ms (budget {args.budget * 1000:.0f} ms)")
+
+    failures = []
+    if total > args.budget:
+        failures.append(f"imports took {total:.2f} s, over the {args.budget:.2f} s budget")
+    everything = subprocess.run(
+        [sys.executable, "-c", top_level_imports(APP_SCRIPTS) + "\nimport sys\nprint(' '.join(sys.modules))"],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    ).stdout.split()
+    eager = [package for package in LAZY_PACKAGES if package in everything]
+    if eager:
+        failures.append(f"imported at startup but should load on demand: {', '.join(eager)}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,454 @@
+"""
+Concurrent-session load test for the dashboard.
+
+Starts W `streamlit run` workers and drives N simulated users against them
+over Streamlit's websocket protocol, the way a browser does: each user loads
+the page (and its images), then switches presets, drags weighting sliders,
+edits hero stats and uploads a weighting settings file, with some think time
+in between. Users are assigned to workers round-robin, as a load balancer
+with sticky sessions would.
+
+Everything runs offline: the workers start with IMAGE_HOST pointing at a
+local stand-in that answers every imgur and GitHub image request with a tiny
+PNG, and the hero thumbnails come from the workers' own static folder.
+
+    python benchmarks/load_test.py --users 20 --workers 2
+    python benchmarks/load_test.py --users 50 --workers 4 --actions 30 --json results.json
+
+Reports p50/p95/p99 latency per action (from sending the rerun to the run
+finishing, including any full rerun a fragment triggers), reruns per second,
+and each worker's resident memory now and at its peak. The load generator
+shares the machine with the workers, so compare numbers from the same
+machine only.
+"""
+import argparse
+import asyncio
+import base64
+import http.cookiejar
+import itertools
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+import websockets  # noqa: E402
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from streamlit.proto.WidgetStates_pb2 import WidgetState  # noqa: E402
+
+from preset_options import preset_options  # noqa: E402
+from settings_io import weighting_settings_json  # noqa: E402
+from stat_schema import STATS, WEIGHT_RANGE  # noqa: E402
+
+APP_PATH = os.path.join(ROOT, "dashboard_hero_tier_list.py")
+XSRF_COOKIE = "_streamlit_xsrf"
+# How often a user picks each action after loading the page.
+ACTION_WEIGHTS = {"preset": 3, "slider": 4, "hero_edit": 2, "upload": 1}
+SLIDER_STEPS = (2, 5)     # a drag sends this many reruns, one per step
+RUN_TIMEOUT = 120         # seconds before a rerun counts as failed
+FINISHED_EARLY = ForwardMsg.ScriptFinishedStatus.FINISHED_EARLY_FOR_RERUN
+FAILED = (ForwardMsg.ScriptFinishedStatus.FINISHED_WITH_COMPILE_ERROR,)
+IMAGE_REFERENCE = re.compile(r'src="([^"]+)"|url\(([^)]+)\)')
+# The smallest valid PNG: one transparent pixel.
+STAND_IN_PNG = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+)
+
+
+# ----------------------------------------
+# Image stand-in and workers
+# ----------------------------------------
+class StandInImageHandler(BaseHTTPRequestHandler):
+    """Answers every GET with the same PNG, in place of imgur and GitHub."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(STAND_IN_PNG)))
+        self.end_headers()
+        self.wfile.write(STAND_IN_PNG)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_image_stand_in(port):
+    server = ThreadingHTTPServer(("127.0.0.1", port), StandInImageHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_workers(n_workers, base_port, image_host):
+    """Launch n_workers Streamlit servers on consecutive ports; returns [(port, Popen)]."""
+    env = dict(os.environ, IMAGE_HOST=image_host)
+    workers = []
+    for port in range(base_port, base_port + n_workers):
+        command = [
+            sys.executable, "-m", "streamlit", "run", APP_PATH,
+            "--server.headless", "true", "--server.port", str(port),
+            "--browser.gatherUsageStats", "false", "--server.fileWatcherType", "none",
+        ]
+        process = subprocess.Popen(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        workers.append((port, process))
+    for port, process in workers:
+        deadline = time.time() + 60
+        while True:
+            try:
+                urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1).read()
+                break
+            except OSError:
+                if process.poll() is not None or time.time() > deadline:
+                    stop_workers(workers)
+                    raise RuntimeError(f"worker on port {port} did not start")
+                time.sleep(0.2)
+    return workers
+
+
+def stop_workers(workers):
+    for _, process in workers:
+        process.terminate()
+    for _, process in workers:
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def memory_kib(pid):
+    """(resident, peak resident) KiB of a process, from /proc (Linux only)."""
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                name, _, value = line.partition(":")
+                if name in ("VmRSS", "VmHWM"):
+                    fields[name] = int(value.split()[0])
+    except OSError:
+        pass
+    return fields.get("VmRSS", 0), fields.get("VmHWM", 0)
+
+
+# ----------------------------------------
+# Simulated user
+# ----------------------------------------
+class Session:
+    """One browser tab: a websocket to a worker plus the widget state the frontend would keep."""
+
+    def __init__(self, port):
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.port = port
+        self.ws = None
+        self.xsrf = None
+        self.session_id = None
+        self.page_script_hash = ""
+        self.query_string = ""
+        self.widgets = {}        # widget key -> (widget id, fragment id)
+        self.states = {}         # widget id -> WidgetState sent with every rerun, like the frontend
+        self.images = set()      # image URLs the page references
+
+    async def connect(self):
+        jar = http.cookiejar.CookieJar()
+        opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar))
+        await asyncio.to_thread(lambda: opener.open(f"{self.base_url}/_stcore/health", timeout=30).read())
+        self.xsrf = next((cookie.value for cookie in jar if cookie.name == XSRF_COOKIE), None)
+        subprotocols = ["streamlit", self.xsrf] if self.xsrf else ["streamlit"]
+        headers = {"Origin": self.base_url}
+        if self.xsrf:
+            headers["Cookie"] = f"{XSRF_COOKIE}={self.xsrf}"
+        self.ws = await websockets.connect(
+            f"ws://127.0.0.1:{self.port}/_stcore/stream",
+            subprotocols=subprotocols, additional_headers=headers, max_size=None
+        )
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    async def rerun(self, widget_state=None, fragment_id=""):
+        """Send a rerun (optionally with one changed widget) and wait for it to finish."""
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.query_string = self.query_string
+        client_state.page_script_hash = self.page_script_hash
+        client_state.fragment_id = fragment_id
+        states = dict(self.states)
+        if widget_state is not None:
+            states[widget_state.id] = widget_state
+            # Button clicks fire once; every other value is kept and resent.
+            if widget_state.WhichOneof("value") != "trigger_value":
+                self.states[widget_state.id] = widget_state
+        client_state.widget_states.widgets.extend(states.values())
+        await self.ws.send(message.SerializeToString())
+        await asyncio.wait_for(self._until_finished(), RUN_TIMEOUT)
+
+    async def _until_finished(self):
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(await self.ws.recv())
+            kind = message.WhichOneof("type")
+            if kind == "new_session":
+                self.page_script_hash = message.new_session.page_script_hash
+                if message.new_session.initialize.session_id:
+                    self.session_id = message.new_session.initialize.session_id
+            elif kind == "page_info_changed":
+                self.query_string = message.page_info_changed.query_string
+            elif kind == "delta":
+                self._read_delta(message.delta)
+            elif kind == "script_finished" and message.script_finished != FINISHED_EARLY:
+                if message.script_finished in FAILED:
+                    raise RuntimeError("script failed to compile")
+                return
+
+    def _read_delta(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        element_type = delta.new_element.WhichOneof("type")
+        element = getattr(delta.new_element, element_type)
+        if element_type == "markdown":
+            self.images.update(src or url for src, url in IMAGE_REFERENCE.findall(element.body))
+        elif element_type == "imgs":
+            self.images.update(img.url for img in element.imgs)
+        elif element_type == "exception":
+            raise RuntimeError(f"app raised {element.type}: {element.message}")
+        widget_id = getattr(element, "id", "")
+        if widget_id.startswith("$$ID-"):
+            # Widget ids end with the widget's key; number inputs are keyed "<hero>_<stat>".
+            self.widgets[widget_id.split("-", 2)[2]] = (widget_id, delta.fragment_id)
+
+    def _absolute(self, url):
+        return url if url.startswith("http") else f"{self.base_url}/{url.lstrip('/')}"
+
+    def fetch_images(self):
+        """Fetch every image the page referenced, as a browser would."""
+        for url in self.images:
+            with urllib.request.urlopen(self._absolute(url), timeout=30) as response:
+                response.read()
+
+    async def upload(self, key, name, content):
+        """Upload a file the way st.file_uploader does: ask for a URL, PUT the file, rerun with it."""
+        request = BackMsg()
+        request.file_urls_request.request_id = uuid.uuid4().hex
+        request.file_urls_request.file_names.append(name)
+        request.file_urls_request.session_id = self.session_id
+        await self.ws.send(request.SerializeToString())
+        response = await asyncio.wait_for(self._file_urls(), RUN_TIMEOUT)
+        if response.error_msg:
+            raise RuntimeError(response.error_msg)
+        urls = response.file_urls[0]
+
+        boundary = uuid.uuid4().hex
+        body = (
+            f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{name}"\r\n'
+            "Content-Type: application/json\r\n\r\n"
+        ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+        headers = {"Content-Type": f"multipart/form-data; boundary={boundary}"}
+        if self.xsrf:
+            headers.update({"X-Xsrftoken": self.xsrf, "Cookie": f"{XSRF_COOKIE}={self.xsrf}"})
+        put = urllib.request.Request(self._absolute(urls.upload_url), data=body, headers=headers, method="PUT")
+        await asyncio.to_thread(lambda: urllib.request.urlopen(put, timeout=30).read())
+
+        widget_id, fragment_id = self.widgets[key]
+        state = WidgetState(id=widget_id)
+        info = state.file_uploader_state_value.uploaded_file_info.add(name=name, size=len(content), file_id=urls.file_id)
+        info.file_urls.CopyFrom(urls)
+        await self.rerun(state, fragment_id)
+
+    async def _file_urls(self):
+        while True:
+            message = ForwardMsg()
+            message.ParseFromString(await self.ws.recv())
+            if message.WhichOneof("type") == "file_urls_response":
+                return message.file_urls_response
+
+
+# ----------------------------------------
+# Actions. Each takes (session, rng) and returns after the app has finished
+# every rerun it caused; its wall time is one latency sample.
+# ----------------------------------------
+async def switch_preset(session, rng):
+    widget_id, fragment_id = session.widgets["preset_choice"]
+    await session.rerun(WidgetState(id=widget_id, string_value=rng.choice(list(preset_options))), fragment_id)
+
+
+async def drag_slider(session, rng, record):
+    """A drag is several reruns in a row, one per step; each is recorded as its own sample."""
+    stat = rng.choice(STATS).name
+    widget_id, fragment_id = session.widgets[stat]
+    value = rng.randint(*WEIGHT_RANGE)
+    for _ in range(rng.randint(*SLIDER_STEPS)):
+        value = min(max(value + rng.choice((-1, 1)), WEIGHT_RANGE[0]), WEIGHT_RANGE[1])
+        state = WidgetState(id=widget_id)
+        state.double_array_value.data.append(value)
+        started = time.perf_counter()
+        await session.rerun(state, fragment_id)
+        record(time.perf_counter() - started)
+
+
+async def edit_hero(session, rng):
+    # The hero editor shows the selected hero's stats, keyed "<hero>_<stat>".
+    stat = rng.choice(STATS).name
+    key = next(key for key in session.widgets if key.endswith(f"_{stat}"))
+    widget_id, fragment_id = session.widgets[key]
+    await session.rerun(WidgetState(id=widget_id, double_value=rng.randint(-5, 5)), fragment_id)
+
+
+async def upload_weighting(session, rng):
+    name = rng.choice(list(preset_options))
+    weighting = np.asarray(preset_options[name]) + np.array([rng.choice((-1, 0, 1)) for _ in STATS])
+    content = weighting_settings_json("Custom", np.clip(weighting, *WEIGHT_RANGE)).encode()
+    await session.upload("upload_weighting", "weighting_settings.json", content)
+
+
+ACTIONS = {"preset": switch_preset, "slider": drag_slider, "hero_edit": edit_hero, "upload": upload_weighting}
+
+
+async def simulate_user(user, port, args, samples, errors):
+    """Load the page, then perform args.actions random actions with think time between them."""
+    rng = random.Random(args.seed + user)
+    await asyncio.sleep(rng.uniform(0, args.ramp_up))
+
+    def record(action):
+        return lambda seconds: samples.setdefault(action, []).append(seconds)
+
+    session = Session(port)
+    try:
+        started = time.perf_counter()
+        await session.connect()
+        await session.rerun()
+        record("page_load")(time.perf_counter() - started)
+        started = time.perf_counter()
+        await asyncio.to_thread(session.fetch_images)
+        record("images")(time.perf_counter() - started)
+    except Exception as error:  # noqa: BLE001 - a failed user is reported, not fatal
+        errors.setdefault("page_load", []).append(repr(error))
+        await session.close()
+        return
+
+    names, weights = zip(*ACTION_WEIGHTS.items())
+    for _ in range(args.actions):
+        await asyncio.sleep(rng.expovariate(1 / args.think_time) if args.think_time else 0)
+        action = rng.choices(names, weights)[0]
+        started = time.perf_counter()
+        try:
+            if action == "slider":
+                await drag_slider(session, rng, record(action))
+            else:
+                await ACTIONS[action](session, rng)
+                record(action)(time.perf_counter() - started)
+        except Exception as error:  # noqa: BLE001
+            errors.setdefault(action, []).append(repr(error))
+            break
+    await session.close()
+
+
+# ----------------------------------------
+# Running and reporting
+# ----------------------------------------
+def percentile(values, p):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(np.ceil(p / 100 * len(ordered))) - 1))]
+
+
+async def run_users(workers, args):
+    samples, errors, peak_rss = {}, {}, {port: 0 for port, _ in workers}
+    done = asyncio.Event()
+
+    async def sample_memory():
+        while not done.is_set():
+            for port, process in workers:
+                peak_rss[port] = max(peak_rss[port], memory_kib(process.pid)[0])
+            await asyncio.sleep(0.5)
+
+    sampler = asyncio.create_task(sample_memory())
+    ports = itertools.cycle([port for port, _ in workers])
+    started = time.perf_counter()
+    await asyncio.gather(*(simulate_user(user, next(ports), args, samples, errors) for user in range(args.users)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await sampler
+    return samples, errors, elapsed, peak_rss
+
+
+def report(samples, errors, elapsed, workers, peak_rss, args):
+    """Print the results table and return them as a dict."""
+    results = {
+        "users": args.users, "workers": args.workers, "actions_per_user": args.actions,
+        "think_time": args.think_time, "elapsed_seconds": elapsed, "actions": {}, "worker_memory": {},
+    }
+    print(f"{args.users} users on {args.workers} workers, {elapsed:.1f} s")
+    print(f"{'action':<12} {'count':>6} {'errors':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'mean ms':>9}")
+    reruns = 0
+    for action in ["page_load", "images", *ACTION_WEIGHTS]:
+        values = samples.get(action, [])
+        failed = len(errors.get(action, []))
+        if not values and not failed:
+            continue
+        stats = {"count": len(values), "errors": failed}
+        if values:
+            stats.update({f"p{p}": percentile(values, p) for p in (50, 95, 99)}, mean=statistics.fmean(values))
+            print(
+                f"{action:<12} {len(values):>6} {failed:>6} "
+                + " ".join(f"{stats[name] * 1000:>9.1f}" for name in ("p50", "p95", "p99", "mean"))
+            )
+        else:
+            print(f"{action:<12} {0:>6} {failed:>6}")
+        if action != "images":
+            reruns += len(values)
+        results["actions"][action] = stats
+    results["reruns_per_second"] = reruns / elapsed
+    print(f"throughput   {reruns / elapsed:.1f} reruns/s")
+
+    for port, process in workers:
+        rss, hwm = memory_kib(process.pid)
+        peak = max(peak_rss[port], rss)
+        results["worker_memory"][str(port)] = {"rss_kib": rss, "peak_rss_kib": peak, "high_water_kib": hwm}
+        print(f"worker :{port}  RSS {rss / 1024:7.1f} MiB   peak during run {peak / 1024:7.1f} MiB   high water {hwm / 1024:7.1f} MiB")
+    for action, messages in errors.items():
+        print(f"ERROR {action}: {len(messages)} failed, e.g. {messages[0]}")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=10, help="concurrent simulated users")
+    parser.add_argument("--workers", type=int, default=1, help="Streamlit worker processes")
+    parser.add_argument("--actions", type=int, default=20, help="actions per user after the page load")
+    parser.add_argument("--think-time", type=float, default=0.5, help="mean seconds between a user's actions")
+    parser.add_argument("--ramp-up", type=float, default=5.0, help="users start spread over this many seconds")
+    parser.add_argument("--port", type=int, default=8700, help="image stand-in port; workers use the ports after it")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    image_server = start_image_stand_in(args.port)
+    workers = start_workers(args.workers, args.port + 1, f"http://127.0.0.1:{args.port}")
+    try:
+        samples, errors, elapsed, peak_rss = asyncio.run(run_users(workers, args))
+        results = report(samples, errors, elapsed, workers, peak_rss, args)
+    finally:
+        stop_workers(workers)
+        image_server.shutdown()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=1)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
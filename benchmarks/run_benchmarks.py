@@ -0,0 +1,184 @@
+"""
+Benchmarks for the tier list pipeline.
+
+Times the pure stages (scoring, tiering, chart rendering, the image index,
+upload parsing) on the stock roster and on synthetic rosters of 1k and 100k
+heroes scaled from default_heroes, with batches of weightings, and drives
+dashboard_hero_tier_list.py headlessly through Streamlit's AppTest for whole
+reruns. Each pure stage reports its median time and its peak traced memory.
+
+    python benchmarks/run_benchmarks.py                    # compare with baseline.json
+    python benchmarks/run_benchmarks.py --quick            # skip 100k heroes and the app
+    python benchmarks/run_benchmarks.py --update-baseline  # record this machine's numbers
+
+Exits non-zero if a stage is slower or uses more memory than the baseline
+allows. Timings are machine-specific: record a baseline on the machine that
+runs the comparison.
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np  # noqa: E402
+
+from charts import render_score_chart  # noqa: E402
+from hero_images import build_image_index  # noqa: E402
+from preset_options import preset_options  # noqa: E402
+from scoring import HERO_MATRIX, HERO_NAMES, score_heroes  # noqa: E402
+from settings_io import hero_settings_json, parse_hero_settings, parse_weighting_settings, weighting_settings_json  # noqa: E402
+from stat_schema import HERO_STAT_RANGE, N_STATS, WEIGHT_RANGE  # noqa: E402
+from tiers import assign_tiers, tier_indices  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+APP_PATH = os.path.join(ROOT, "dashboard_hero_tier_list.py")
+
+ROSTER_SIZES = (len(HERO_NAMES), 1_000, 100_000)
+# Weighting batch sizes per roster size, kept under ~100M scores.
+BATCH_SIZES = {1_000: (1, 100, 1_000), 100_000: (1, 100)}
+MIN_SECONDS = 0.2      # keep repeating a stage until this much time has passed...
+MAX_REPEATS = 50       # ...or it ran this many times
+NOISE_SECONDS = 0.001  # differences below this are never regressions
+
+
+def synthetic_roster(n_heroes, seed=0):
+    """n_heroes rows drawn from the stock roster with +/-1 jitter, as int8."""
+    rng = np.random.default_rng(seed)
+    rows = HERO_MATRIX[rng.integers(0, len(HERO_MATRIX), n_heroes)].astype(np.int16)
+    rows += rng.integers(-1, 2, rows.shape)
+    return np.clip(rows, *HERO_STAT_RANGE).astype(np.int8)
+
+
+def weighting_batch(size, seed=0):
+    """`size` random weightings in the slider range."""
+    return np.random.default_rng(seed).integers(WEIGHT_RANGE[0], WEIGHT_RANGE[1] + 1, (size, N_STATS))
+
+
+def measure(stage):
+    """(median seconds, peak traced bytes) of a zero-argument callable."""
+    stage()  # warm up caches and lazy imports
+    times = []
+    started = time.perf_counter()
+    while len(times) < MAX_REPEATS and (len(times) < 3 or time.perf_counter() - started < MIN_SECONDS):
+        t = time.perf_counter()
+        stage()
+        times.append(time.perf_counter() - t)
+    tracemalloc.start()
+    try:
+        stage()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def pure_stages(quick):
+    """(name, callable) for every pure stage."""
+    # The weighting a new session opens on.
+    weighting = np.array(next(iter(preset_options.values())))
+    stages = []
+    for n in ROSTER_SIZES:
+        if quick and n > 1_000:
+            continue
+        matrix = HERO_MATRIX if n == len(HERO_NAMES) else synthetic_roster(n)
+        scores = score_heroes(matrix, weighting)
+        stages.append((f"score/{n}", lambda m=matrix: score_heroes(m, weighting)))
+        stages.append((f"tier/{n}", lambda s=scores: assign_tiers(s)))
+        for batch in BATCH_SIZES.get(n, ()):
+            weightings = weighting_batch(batch)
+            stages.append((f"score_batch/{n}x{batch}", lambda m=matrix, w=weightings: score_heroes(m, w)))
+            stages.append((f"tier_batch/{n}x{batch}", lambda s=score_heroes(matrix, weightings): tier_indices(s)))
+
+    tier_list = assign_tiers(score_heroes(HERO_MATRIX, weighting))
+    stages.append(("chart_png", lambda: render_score_chart(HERO_NAMES, tier_list, "Benchmark")))
+    stages.append(("image_index", build_image_index))
+
+    weighting_file = weighting_settings_json(next(iter(preset_options)), weighting).encode()
+    hero_file = hero_settings_json(HERO_MATRIX, HERO_MATRIX).encode()
+    stages.append(("parse_weighting", lambda: parse_weighting_settings(io.BytesIO(weighting_file), weighting)))
+    stages.append(("parse_hero_stats", lambda: parse_hero_settings(io.BytesIO(hero_file))))
+    return stages
+
+
+def app_stages():
+    """{name: seconds} for whole dashboard runs, driven by AppTest."""
+    from streamlit.testing.v1 import AppTest
+
+    results = {}
+
+    def timed(name, run):
+        t = time.perf_counter()
+        app = run()
+        results[name] = time.perf_counter() - t
+        if app.exception:
+            raise RuntimeError(f"{name}: {app.exception[0].message}")
+        return app
+
+    timed("app/first_session", lambda: AppTest.from_file(APP_PATH, default_timeout=300).run())
+    app = timed("app/new_session", lambda: AppTest.from_file(APP_PATH, default_timeout=300).run())
+    timed("app/slider_rerun", lambda: app.slider(key="Economy").set_value(-3).run())
+    timed("app/preset_rerun", lambda: app.selectbox(key="preset_choice").set_value(list(preset_options)[1]).run())
+    timed("app/hero_edit_rerun", lambda: app.number_input[0].set_value(int(app.number_input[0].value) - 1).run())
+    return results
+
+
+def compare(results, baseline, time_tolerance, memory_tolerance):
+    """Lines describing every stage that regressed against the baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        limit = base["seconds"] * time_tolerance
+        if result["seconds"] > limit and result["seconds"] - base["seconds"] > NOISE_SECONDS:
+            regressions.append(f"{name}: {result['seconds'] * 1000:.2f} ms vs baseline {base['seconds'] * 1000:.2f} ms")
+        if base.get("peak_bytes") and result.get("peak_bytes") and result["peak_bytes"] > base["peak_bytes"] * memory_tolerance:
+            regressions.append(f"{name}: peak {result['peak_bytes']:,} B vs baseline {base['peak_bytes']:,} B")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--quick", action="store_true", help="skip the 100k roster and the AppTest stages")
+    parser.add_argument("--update-baseline", action="store_true", help=f"write the results to {BASELINE_PATH}")
+    parser.add_argument("--time-tolerance", type=float, default=2.0, help="allowed slowdown factor (default 2.0)")
+    parser.add_argument("--memory-tolerance", type=float, default=1.5, help="allowed peak memory factor (default 1.5)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, stage in pure_stages(args.quick):
+        seconds, peak = measure(stage)
+        results[name] = {"seconds": seconds, "peak_bytes": peak}
+        print(f"{name:<28} {seconds * 1000:10.3f} ms {peak / 2**20:10.2f} MiB peak")
+    if not args.quick:
+        for name, seconds in app_stages().items():
+            results[name] = {"seconds": seconds}
+            print(f"{name:<28} {seconds * 1000:10.3f} ms")
+
+    if args.update_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+        print(f"Wrote {BASELINE_PATH}")
+        return 0
+
+    try:
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print("No baseline yet; run with --update-baseline to record one.")
+        return 0
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
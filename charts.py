@@ -0,0 +1,123 @@
+"""
+Hero score bar chart.
+
+Two renderers share the same data: a static PNG drawn with matplotlib, and a
+client-side Vega-Lite (Altair) spec that only ships the hero scores to the
+browser. Both libraries are imported on first use, so they stay off the
+app's cold-start path.
+"""
+import io
+
+import numpy as np
+
+from tiers import TIERS, TIER_COLORS
+
+CHART_DPI = 120
+
+
+def _ascending(names, tier_list):
+    """Hero names, scores and tier labels sorted by ascending score."""
+    ascending = np.argsort(tier_list.scores, kind="stable")
+    sorted_names = [names[i] for i in ascending]
+    sorted_tiers = [TIERS[tier_list.tier_of[i]] for i in ascending]
+    return sorted_names, tier_list.scores[ascending], sorted_tiers
+
+
+def render_score_chart(names, tier_list, title, dpi=CHART_DPI):
+    """Render the ascending hero score bar chart and return it as PNG bytes."""
+    # matplotlib is only loaded once a chart is actually drawn.
+    from matplotlib.figure import Figure
+    from matplotlib.patches import Patch
+
+    sorted_hero_names, sorted_hero_scores, sorted_tiers = _ascending(names, tier_list)
+    bar_colors = [TIER_COLORS[tier] for tier in sorted_tiers]
+
+    # A bare Figure is not registered with pyplot, so nothing outlives this call
+    # and concurrent sessions never share pyplot's global state.
+    fig = Figure(figsize=(14, 7), dpi=dpi)
+    try:
+        ax = fig.subplots()
+        ax.bar(sorted_hero_names, sorted_hero_scores, color=bar_colors)
+        ax.set_ylabel("Scores", fontsize="x-large")
+        ax.set_title(title, fontweight='bold', fontsize=18)
+        ax.tick_params(axis='x', labelrotation=45)
+        for label, color in zip(ax.get_xticklabels(), bar_colors):
+            label.set_horizontalalignment('right')
+            label.set_color(color)
+
+        legend_handles = [Patch(color=TIER_COLORS[tier], label=f"Tier {tier}") for tier in TIERS]
+        ax.legend(handles=legend_handles, title="Tier Colors", loc="upper left", fontsize='x-large', title_fontsize='x-large')
+        fig.tight_layout()
+        ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", bbox_inches="tight")
+    finally:
+        fig.clear()
+    return buffer.getvalue()
+
+
+def score_chart_spec(names, tier_list, title):
+    """Build the same chart as an Altair spec rendered in the browser."""
+    import altair as alt
+
+    sorted_hero_names, sorted_hero_scores, sorted_tiers = _ascending(names, tier_list)
+    rows = [
+        {"Hero": hero, "Score": float(score), "Tier": tier}
+        for hero, score, tier in zip(sorted_hero_names, sorted_hero_scores, sorted_tiers)
+    ]
+    tier_scale = alt.Scale(domain=list(TIERS), range=[TIER_COLORS[tier] for tier in TIERS])
+    return (
+        alt.Chart(alt.Data(values=rows), title=title)
+        .mark_bar()
+        .encode(
+            x=alt.X("Hero:N", sort=sorted_hero_names, axis=alt.Axis(labelAngle=-45, title=None)),
+            y=alt.Y("Score:Q", title="Scores"),
+            color=alt.Color("Tier:N", scale=tier_scale, legend=alt.Legend(title="Tier Colors")),
+            tooltip=["Hero:N", "Score:Q", "Tier:N"],
+        )
+        .properties(height=450)
+    )
+
+
+def matchup_heatmap_spec(hero_names, villain_names, values, color_by="Score"):
+    """
+    Vega-Lite spec of a heroes x villains heatmap.
+
+    `values` is (n_villains, n_heroes): normalized scores when color_by is
+    "Score", indices into TIERS when it is "Tier". Heroes are ordered by their
+    average across villains, best first.
+    """
+    import altair as alt
+
+    values = np.asarray(values)
+    if color_by == "Tier":
+        hero_order = np.argsort(values.mean(axis=0), kind="stable")
+        rows = [
+            {"Hero": hero, "Villain": villain, "Tier": TIERS[values[v, h]]}
+            for v, villain in enumerate(villain_names)
+            for h, hero in enumerate(hero_names)
+        ]
+        color = alt.Color("Tier:N", scale=alt.Scale(domain=list(TIERS), range=[TIER_COLORS[tier] for tier in TIERS]))
+        tooltip = ["Hero:N", "Villain:N", "Tier:N"]
+    else:
+        hero_order = np.argsort(-values.mean(axis=0), kind="stable")
+        rows = [
+            {"Hero": hero, "Villain": villain, "Score": round(float(values[v, h]), 2)}
+            for v, villain in enumerate(villain_names)
+            for h, hero in enumerate(hero_names)
+        ]
+        color = alt.Color("Score:Q", scale=alt.Scale(scheme="redyellowgreen", domainMid=0), title="Std. devs from mean")
+        tooltip = ["Hero:N", "Villain:N", "Score:Q"]
+    return (
+        alt.Chart(alt.Data(values=rows))
+        .mark_rect()
+        .encode(
+            x=alt.X("Villain:N", sort=list(villain_names), axis=alt.Axis(labelAngle=-45, title=None)),
+            y=alt.Y("Hero:N", sort=[hero_names[i] for i in hero_order], title=None),
+            color=color,
+            tooltip=tooltip,
+        )
+        .properties(height=alt.Step(14))
+        .to_dict()
+    )
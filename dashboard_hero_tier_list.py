@@ -2,102 +2,197 @@
 The Living Marvel Champions Tier List
 """
 #%%
+import functools
+
 import streamlit as st
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.patches import Patch
-import pandas as pd
-import copy
-import os
-from PIL import Image
-import json
-from hero_image_urls import hero_image_urls
-from default_heroes import default_heroes
+from thumbnails import TIER_GRID_CSS, hosted_image_url, tier_grid_html
+from tier_grid_image import render_tier_grid
+from fragment_deps import mark_rendered, rerun_if_changed
+from profiling import DEBUG_PARAM, debug_enabled, debug_panel, finish_run, profiled, stage, start_run
+from url_state import OVERRIDES_PARAM, WEIGHTING_PARAM, decode_overrides, decode_weighting, encode_overrides, encode_weighting
 from preset_options import preset_options
-from help_tips import help_tips
+from stat_schema import STATS, STAT_NAMES, WEIGHT_RANGE, HERO_STAT_RANGE
+from settings_io import SettingsError, hero_settings_json, parse_hero_settings, parse_weighting_settings, weighting_settings_json
+from scoring import HERO_MATRIX, HERO_NAMES, apply_overrides, matrix_digest, overrides_digest, weighting_key
+from tiers import TIERS
+from charts import score_chart_spec
+from preset_results import DEFAULT_MATRIX_KEY, is_default_roster
+from pipeline import cached_score_chart, cached_tier_list, cached_tier_stability, cached_weightings_for_tier, preset_results
 
-socials_banner = st.markdown(
-    """
-    <style>
-        .social-bar {
-            display: flex;
-            justify-content: center;
-            align-items: center;
-            background-color: transparent;
-            padding: 5px;
-            border: 2px solid white;
-            border-radius: 8px;
-            box-shadow: 0px 2px 5px rgba(0, 0, 0, 0.2);
-        }
-        .social-bar .left-content {
-            display: flex;
-            align-items: center;
-            margin-right: auto;
-        }
-        .social-bar .left-content .logo {
-            height: 40px;
-            margin-right: 10px;
-        }
-        .social-bar .social-links {
-            display: flex;
-            justify-content: center;
-        }
-        .social-links a {
-            margin-right: 20px;
-            transition: opacity 0.3s ease-in-out;
-        }
-        .social-links a:hover {
-            opacity: 0.7;
-        }
-        .social-text {
-            font-family: Arial, sans-serif;
-            font-size: 16px;
-            font-weight: bold;
-            margin-right: 15px;
-            color: white;
-            text-shadow: 1px 1px 3px rgba(0, 0, 0, 0.5);
-        }
-    </style>
-    <div class="social-bar">
-        <div class="left-content">
-            <img class="logo" src="https://github.com/alechoward-lab/Marvel-Champions-Hero-Tier-List/blob/main/images/logo/Daring_Lime_Logo.png?raw=true" alt="Your Logo">
-            <span class="social-text">Click the icons to see my YouTube channel and Discord:</span>
-        </div>
-        <div class="social-links">
-            <a href="https://www.youtube.com/channel/UCpV2UWmBTAeIKUso1LkeU2A" target="_blank">
-                <img src="https://github.com/alechoward-lab/Marvel-Champions-Hero-Tier-List/blob/main/images/logo/youtube_logo.png?raw=true" alt="YouTube" style="height: 30px;">
-            </a>
-            <a href="https://discord.gg/ReF5jDSHqV" target="_blank">
-                <img src="https://github.com/alechoward-lab/Marvel-Champions-Hero-Tier-List/blob/main/images/logo/Discord-Logo.png?raw=true" alt="Discord" style="height: 30px;">
-            </a>
+start_run()
+
+# Build the preset tier lists once per process, before any session needs them.
+with stage("preset_results"):
+    precomputed_presets = preset_results()
+
+with stage("banner"):
+    logo_url, youtube_logo_url, discord_logo_url = (
+        hosted_image_url(f"https://github.com/alechoward-lab/Marvel-Champions-Hero-Tier-List/blob/main/images/logo/{name}?raw=true")
+        for name in ("Daring_Lime_Logo.png", "youtube_logo.png", "Discord-Logo.png")
+    )
+    socials_banner = st.markdown(
+        f"""
+        <style>
+            .social-bar {{
+                display: flex;
+                justify-content: center;
+                align-items: center;
+                background-color: transparent;
+                padding: 5px;
+                border: 2px solid white;
+                border-radius: 8px;
+                box-shadow: 0px 2px 5px rgba(0, 0, 0, 0.2);
+            }}
+            .social-bar .left-content {{
+                display: flex;
+                align-items: center;
+                margin-right: auto;
+            }}
+            .social-bar .left-content .logo {{
+                height: 40px;
+                margin-right: 10px;
+            }}
+            .social-bar .social-links {{
+                display: flex;
+                justify-content: center;
+            }}
+            .social-links a {{
+                margin-right: 20px;
+                transition: opacity 0.3s ease-in-out;
+            }}
+            .social-links a:hover {{
+                opacity: 0.7;
+            }}
+            .social-text {{
+                font-family: Arial, sans-serif;
+                font-size: 16px;
+                font-weight: bold;
+                margin-right: 15px;
+                color: white;
+                text-shadow: 1px 1px 3px rgba(0, 0, 0, 0.5);
+            }}
+        </style>
+        <div class="social-bar">
+            <div class="left-content">
+                <img class="logo" src="{logo_url}" alt="Your Logo">
+                <span class="social-text">Click the icons to see my YouTube channel and Discord:</span>
+            </div>
+            <div class="social-links">
+                <a href="https://www.youtube.com/channel/UCpV2UWmBTAeIKUso1LkeU2A" target="_blank">
+                    <img src="{youtube_logo_url}" alt="YouTube" style="height: 30px;">
+                </a>
+                <a href="https://discord.gg/ReF5jDSHqV" target="_blank">
+                    <img src="{discord_logo_url}" alt="Discord" style="height: 30px;">
+                </a>
+            </div>
         </div>
-    </div>
-    """,
-    unsafe_allow_html=True
-)
+        """,
+        unsafe_allow_html=True
+    )
 
 # ----------------------------------------
-# Define update_preset callback so that selecting a weighting preset updates slider values.
+# Weighting state. The weighting lives in session state as one array; each
+# slider (keyed by its stat name) writes its own entry back on change. The
+# chosen preset is kept under chosen_preset, outside the selector's widget
+# key, because Streamlit drops widget state when the user visits another page.
 # ----------------------------------------
+def set_weighting(values):
+    """Replace the session weighting and move the sliders to match."""
+    st.session_state.weighting = np.array(values, dtype=int)
+    for stat, value in zip(STATS, st.session_state.weighting):
+        st.session_state[stat.name] = int(value)
+
+def update_weight(i):
+    st.session_state.weighting[i] = st.session_state[STATS[i].name]
+
+def set_preset_choice(name):
+    """Record the chosen preset and show it in the preset selector."""
+    st.session_state.chosen_preset = name
+    st.session_state.preset_choice = name
+
+# Define update_preset callback so that selecting a weighting preset updates slider values.
 def update_preset():
-    preset = st.session_state.preset_choice
+    preset = st.session_state.chosen_preset = st.session_state.preset_choice
     if preset != "Custom":
-        preset_vals = preset_options[preset]
-        st.session_state["Economy"] = int(preset_vals[0])
-        st.session_state["Tempo"] = int(preset_vals[1])
-        st.session_state["Card Value"] = int(preset_vals[2])
-        st.session_state["Survivability"] = int(preset_vals[3])
-        st.session_state["Villain Damage"] = int(preset_vals[4])
-        st.session_state["Threat Removal"] = int(preset_vals[5])
-        st.session_state["Reliability"] = int(preset_vals[6])
-        st.session_state["Minion Control"] = int(preset_vals[7])
-        st.session_state["Control Boon"] = int(preset_vals[8])
-        st.session_state["Support Boon"] = int(preset_vals[9])
-        st.session_state["Unique Broken Builds Boon"] = int(preset_vals[10])
-        st.session_state["Late Game Power Boon"] = int(preset_vals[11])
-        st.session_state["Simplicity"] = int(preset_vals[12])
-        st.session_state["Stun/Confuse Boon"] = int(preset_vals[13])
-        st.session_state["Multiplayer Consistency Boon"] = int(preset_vals[14])
+        set_weighting(preset_options[preset])
+
+def from_url(param, decode, *args):
+    """Decode a shared setting from the page URL; None if absent or malformed."""
+    text = st.query_params.get(param)
+    if text is None:
+        return None
+    try:
+        return decode(text, *args)
+    except ValueError:
+        st.toast("Part of this link could not be read, so the default settings were used instead.")
+        return None
+
+if "weighting" not in st.session_state:
+    shared_weighting = from_url(WEIGHTING_PARAM, decode_weighting)
+    if shared_weighting is not None:
+        # A linked weighting shows as its preset when it matches one.
+        set_preset_choice(next(
+            (name for name, preset in preset_options.items() if np.array_equal(preset, shared_weighting)), "Custom"
+        ))
+        set_weighting(shared_weighting)
+    else:
+        # Open on the first preset, which is what the preset selector shows.
+        set_preset_choice(next(iter(preset_options)))
+        set_weighting(preset_options[st.session_state.chosen_preset])
+
+def current_weighting():
+    return st.session_state.weighting
+
+def current_plot_title():
+    preset_choice = st.session_state.get("chosen_preset", "Custom")
+    return preset_choice if preset_choice != "Custom" else "Custom Weighting"
+
+def weighting_inputs():
+    """What the tier grid and chart depend on from the weighting editor."""
+    return weighting_key(current_weighting()), current_plot_title()
+
+# ----------------------------------------
+# Session hero stats. Every session shares a read-only base matrix (the
+# default roster unless the user uploaded their own) and stores only the
+# heroes it edited, as {row: stats} overrides. heroes_version is bumped on
+# every edit so the overrides digest is only recomputed after a change.
+# ----------------------------------------
+if "hero_overrides" not in st.session_state:
+    st.session_state.hero_names = HERO_NAMES
+    st.session_state.hero_base = HERO_MATRIX
+    st.session_state.hero_base_key = DEFAULT_MATRIX_KEY
+    # Linked hero edits are always against the stock roster.
+    st.session_state.hero_overrides = from_url(OVERRIDES_PARAM, decode_overrides, len(HERO_NAMES)) or {}
+    st.session_state.heroes_version = 0
+
+def heroes_changed():
+    st.session_state.heroes_version += 1
+
+def hero_stats(row):
+    """A hero's current stats: its override if edited, else the base row."""
+    override = st.session_state.hero_overrides.get(row)
+    return override if override is not None else st.session_state.hero_base[row]
+
+def set_hero_base(names, matrix):
+    st.session_state.hero_names = names
+    st.session_state.hero_base = matrix
+    st.session_state.hero_base_key = matrix_digest(matrix)
+    st.session_state.hero_overrides = {}
+
+def current_roster():
+    """(names, base matrix, base digest, overrides, overrides digest) for the session."""
+    cached = st.session_state.get("_overrides_key")
+    if cached is None or cached[0] != st.session_state.heroes_version:
+        cached = (st.session_state.heroes_version, overrides_digest(st.session_state.hero_overrides))
+        st.session_state._overrides_key = cached
+    return (
+        st.session_state.hero_names,
+        st.session_state.hero_base,
+        st.session_state.hero_base_key,
+        st.session_state.hero_overrides,
+        cached[1],
+    )
 
 # ----------------------------------------
 # Main App Content Header
@@ -117,358 +212,247 @@ st.markdown(
 )
 
 # ----------------------------------------
-# Layout: Two columns side by side
-# ----------------------------------------
-col1, col2 = st.columns(2)
-# ----------------------------------------
-# Column 1: Weighting settings with separate upload expander
+# Weighting editor. Drawn inside the tier list fragment below, so moving a
+# slider reruns the editors and the tier list but not the rest of the page.
 # ----------------------------------------
-with col1:
+@profiled("weighting_editor")
+def weighting_editor():
     with st.expander("Upload Weighting Settings (click to expand)"):
         uploaded_weighting = st.file_uploader("Upload Weighting Settings", type="json", key="upload_weighting")
-        if uploaded_weighting is not None:
-            weighting_settings = json.load(uploaded_weighting)
-            # Map keys from the file to the keys used in the app
-            key_map = {
-                "preset_choice": "preset_choice",
-                "economy": "Economy",
-                "tempo": "Tempo",
-                "card_value": "Card Value",
-                "survivability": "Survivability",
-                "villain_damage": "Villain Damage",
-                "threat_removal": "Threat Removal",
-                "reliability": "Reliability",
-                "minion_control": "Minion Control",
-                "control": "Control Boon",
-                "support": "Support Boon",
-                "unique_builds": "Unique Broken Builds Boon",
-                "late_game": "Late Game Power Boon",
-                "simplicity": "Simplicity",
-                "status_cards": "Stun/Confuse Boon",
-                "multiplayer_consistency": "Multiplayer Consistency Boon",
-                "weighting": "weighting"
-            }
-            # Update session state using the mapped keys
-            for file_key, file_value in weighting_settings.items():
-                mapped_key = key_map.get(file_key, file_key)
-                st.session_state[mapped_key] = file_value
-
-            # If the file has a "weighting" key, update session_state.weighting
-            if "weighting" in weighting_settings:
-                st.session_state.weighting = np.array(weighting_settings["weighting"])
-            st.success("Weighting settings loaded successfully!")
-
-    
+        # Apply each uploaded file once, not on every rerun while it stays in the uploader.
+        if uploaded_weighting is not None and st.session_state.get("_applied_weighting_file") != uploaded_weighting.file_id:
+            st.session_state._applied_weighting_file = uploaded_weighting.file_id
+            try:
+                with stage("upload_parsing"):
+                    settings = parse_weighting_settings(uploaded_weighting, current_weighting())
+            except SettingsError as error:
+                st.error(f"Could not load the weighting settings: {error}")
+            else:
+                if settings.preset_choice is not None:
+                    set_preset_choice(settings.preset_choice)
+                set_weighting(settings.weighting)
+                st.toast("Weighting settings loaded successfully!")
+
     with st.expander("Edit Weighting Factors (click to expand)"):
         st.markdown(
         "If you don't want a category to affect the list, set it to 0. If you set something negative, the heroes with negative stats will go up, and the heroes with positive stats will go down."
     )
         # Select weighting preset and sliders
-        preset_choice = st.selectbox(
-            "Select Weighting Option", 
+        if "preset_choice" not in st.session_state:
+            # Re-seed the selector after a visit to another page, as for the sliders.
+            st.session_state.preset_choice = st.session_state.chosen_preset
+        st.selectbox(
+            "Select Weighting Option",
             list(preset_options.keys()) + ["Custom"],
             key="preset_choice",
             on_change=update_preset
         )
-        
-        Economy = st.slider(
-            "Economy",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Economy", 4),
-            key="Economy",
-            help=help_tips["Economy"]
-        )
-        Tempo = st.slider(
-            "Tempo",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Tempo", 2),
-            key="Tempo",
-            help=help_tips["Tempo"]
-        )
-        Card_Value = st.slider(
-            "Card Value",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Card Value", 2),
-            key="Card Value",
-            help=help_tips["Card Value"]
-        )
-        Survivability = st.slider(
-            "Survivability",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Survivability", 2),
-            key="Survivability",
-            help=help_tips["Survivability"]
-        )
-        Villain_Damage = st.slider(
-            "Villain Damage",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Villain Damage", 1),
-            key="Villain Damage",
-            help=help_tips["Villain Damage"]
-        )
-        Threat_Removal = st.slider(
-            "Threat Removal",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Threat Removal", 2),
-            key="Threat Removal",
-            help=help_tips["Threat Removal"]
-        )
-        Reliability = st.slider(
-            "Reliability",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Reliability", 3),
-            key="Reliability",
-            help=help_tips["Reliability"]
-        )
-        Minion_Control = st.slider(
-            "Minion Control",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Minion Control", 1),
-            key="Minion Control",
-            help=help_tips["Minion Control"]
-        )
-        Control_Boon = st.slider(
-            "Control Boon",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Control Boon", 2),
-            key="Control Boon",
-            help=help_tips["Control Boon"]
-        )
-        Support_Boon = st.slider(
-            "Support Boon",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Support Boon", 2),
-            key="Support Boon",
-            help=help_tips["Support Boon"]
-        )
-        Unique_Broken_Builds_Boon = st.slider(
-            "Unique Broken Builds Boon",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Unique Broken Builds Boon", 1),
-            key="Unique Broken Builds Boon",
-            help=help_tips["Unique Broken Builds Boon"]
-        )
-        Late_Game_Power_Boon = st.slider(
-            "Late Game Power Boon",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Late Game Power Boon", 1),
-            key="Late Game Power Boon",
-            help=help_tips["Late Game Power Boon"]
-        )
-        Simplicity = st.slider(
-            "Simplicity",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Simplicity", 0),
-            key="Simplicity",
-            help=help_tips["Simplicity"]
-        )
-        Stun_Confuse_Boon = st.slider(
-            "Stun/Confuse Boon",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Stun/Confuse Boon", 0),
-            key="Stun/Confuse Boon",
-            help=help_tips["Stun/Confuse Boon"]
-        )
-        Multiplayer_Consistency_Boon = st.slider(
-            "Multiplayer Consistency Boon",
-            min_value=-10,
-            max_value=10,
-            value=st.session_state.get("Multiplayer Consistency Boon", 0),
-            key="Multiplayer Consistency Boon",
-            help=help_tips["Multiplayer Consistency Boon"]
+
+        for i, stat in enumerate(STATS):
+            # Sliders lose their state when the user visits another page.
+            if stat.name not in st.session_state:
+                st.session_state[stat.name] = int(current_weighting()[i])
+            st.slider(
+                stat.name,
+                min_value=WEIGHT_RANGE[0],
+                max_value=WEIGHT_RANGE[1],
+                key=stat.name,
+                on_change=update_weight,
+                args=(i,),
+                help=stat.help
+            )
+
+        # Download button to save weighting settings. The file is only built when clicked.
+        weighting_json = functools.partial(
+            weighting_settings_json, st.session_state.chosen_preset, current_weighting().copy()
         )
-        
-        # Create the weighting array from slider values
-        weighting = np.array([
-            st.session_state.get("Economy", 4),
-            st.session_state.get("Tempo", 2),
-            st.session_state.get("Card Value", 2),
-            st.session_state.get("Survivability", 2),
-            st.session_state.get("Villain Damage", 1),
-            st.session_state.get("Threat Removal", 2),
-            st.session_state.get("Reliability", 3),
-            st.session_state.get("Minion Control", 1),
-            st.session_state.get("Control Boon", 2),
-            st.session_state.get("Support Boon", 2),
-            st.session_state.get("Unique Broken Builds Boon", 1),
-            st.session_state.get("Late Game Power Boon", 1),
-            st.session_state.get("Simplicity", 0),
-            st.session_state.get("Stun/Confuse Boon", 0),
-            st.session_state.get("Multiplayer Consistency Boon", 0)
-        ])
-        
-        # Determine plot title from preset
-        if preset_choice != "Custom":
-            plot_title = f"{preset_choice}"
-        else:
-            plot_title = "Custom Weighting"
-        
-        # Download button to save weighting settings
-        weighting_settings = {
-            "preset_choice": st.session_state.preset_choice,
-            "Economy": st.session_state.Economy,
-            "Tempo": st.session_state.Tempo,
-            "Card Value": st.session_state["Card Value"],
-            "Survivability": st.session_state.Survivability,
-            "Villain Damage": st.session_state["Villain Damage"],
-            "Threat Removal": st.session_state["Threat Removal"],
-            "Reliability": st.session_state.Reliability,
-            "Minion Control": st.session_state["Minion Control"],
-            "Control Boon": st.session_state["Control Boon"],
-            "Support Boon": st.session_state["Support Boon"],
-            "Unique Broken Builds Boon": st.session_state["Unique Broken Builds Boon"],
-            "Late Game Power Boon": st.session_state["Late Game Power Boon"],
-            "Simplicity": st.session_state.Simplicity,
-            "Stun/Confuse Boon": st.session_state["Stun/Confuse Boon"],
-            "Multiplayer Consistency Boon": st.session_state["Multiplayer Consistency Boon"],
-            "weighting": weighting.tolist()
-        }
-        weighting_json = json.dumps(weighting_settings)
         st.download_button("Download Weighting Settings", weighting_json, "weighting_settings.json")
+        st.caption("Your weighting and hero edits are also kept in this page's address: bookmark it or share the link.")
 
 # ----------------------------------------
-# Column 2: Hero Stats with separate upload expander
+# Hero stats editor, also drawn inside the tier list fragment.
 # ----------------------------------------
-with col2:
+@profiled("hero_editor")
+def hero_editor():
     with st.expander("Upload Hero Stats (click to expand)"):
         uploaded_hero_stats = st.file_uploader("Upload Hero Stats", type="json", key="upload_hero_stats")
-        if uploaded_hero_stats is not None:
-            hero_stats_settings = json.load(uploaded_hero_stats)
-            if "heroes" in hero_stats_settings:
-                st.session_state.heroes = {hero: np.array(stats) for hero, stats in hero_stats_settings["heroes"].items()}
-            if "default_heroes" in hero_stats_settings:
-                st.session_state.default_heroes = {hero: np.array(stats) for hero, stats in hero_stats_settings["default_heroes"].items()}
-            st.success("Hero stats loaded successfully!")
-    
+        if uploaded_hero_stats is not None and st.session_state.get("_applied_hero_file") != uploaded_hero_stats.file_id:
+            st.session_state._applied_hero_file = uploaded_hero_stats.file_id
+            try:
+                with stage("upload_parsing"):
+                    settings = parse_hero_settings(uploaded_hero_stats)
+            except SettingsError as error:
+                st.error(f"Could not load the hero stats: {error}")
+            else:
+                set_hero_base(HERO_NAMES, HERO_MATRIX if settings.base is None else settings.base)
+                st.session_state.hero_overrides = settings.overrides
+                heroes_changed()
+                st.toast("Hero stats loaded successfully!")
+
     with st.expander("Edit Hero Stats (click to expand)"):
         st.markdown(
         "I limited myself to -5 to 5 when choosing hero stats, but I left you the option to go from -10 to 10. This was to allow you to make the difference between heroes more extreme if you wanted."
     )
-        # Initialize hero stats if not set
-        if "heroes" not in st.session_state:
-            st.session_state.heroes = copy.deepcopy(default_heroes)
-            st.session_state.default_heroes = copy.deepcopy(default_heroes)
-        
-        # List of stat names that match our help_tips keys
-        stat_names = ["Economy", "Tempo", "Card Value", "Survivability", "Villain Damage",
-                      "Threat Removal", "Reliability", "Minion Control", "Control Boon", "Support Boon",
-                      "Unique Broken Builds Boon", "Late Game Power Boon", "Simplicity", "Stun/Confuse Boon",
-                      "Multiplayer Consistency Boon"]
-        
         # Select a hero to modify (searchable dropdown)
-        hero_to_modify = st.selectbox("Select a Hero to Modify", list(st.session_state.heroes.keys()), key="hero_choice")
-        
+        hero_to_modify = st.selectbox("Select a Hero to Modify", st.session_state.hero_names, key="hero_choice")
+        hero_row = st.session_state.hero_names.index(hero_to_modify)
+
         # Callback to update the current hero's stats automatically
         def update_current_hero_stats():
             new_stats = []
-            for stat in stat_names:
+            for stat in STAT_NAMES:
                 new_stats.append(st.session_state.get(f"{hero_to_modify}_{stat}", 0))
-            st.session_state.heroes[hero_to_modify] = np.array(new_stats)
-        
+            st.session_state.hero_overrides[hero_row] = np.array(new_stats, dtype=np.int8)
+            heroes_changed()
+
         # Display number inputs with help tips for each stat
-        current_stats = st.session_state.heroes[hero_to_modify]
-        for i, stat in enumerate(stat_names):
+        current_stats = hero_stats(hero_row)
+        for i, stat in enumerate(STATS):
             st.number_input(
-                f"{hero_to_modify} - {stat}",
+                f"{hero_to_modify} - {stat.name}",
                 value=int(current_stats[i]),
-                min_value=-10,
-                max_value=10,
-                key=f"{hero_to_modify}_{stat}",
+                min_value=HERO_STAT_RANGE[0],
+                max_value=HERO_STAT_RANGE[1],
+                key=f"{hero_to_modify}_{stat.name}",
                 on_change=update_current_hero_stats,
-                help=help_tips.get(stat, "")
+                help=stat.help
             )
-        
+
         # Button to update all heroes to match the selected hero's stats
         if st.button("Update All Heroes to These Stats"):
-            new_stats = st.session_state.heroes[hero_to_modify]
-            for hero in st.session_state.heroes.keys():
-                st.session_state.heroes[hero] = np.array(new_stats)
-            st.success("All hero stats updated to match the current hero.")
-        
+            new_stats = np.array(hero_stats(hero_row))
+            st.session_state.hero_overrides = {row: new_stats for row in range(len(st.session_state.hero_names))}
+            heroes_changed()
+            st.toast("All hero stats updated to match the current hero.")
+
         # Button to reset all heroes to default
         if st.button("Reset All Heroes to Default"):
-            st.session_state.heroes = copy.deepcopy(st.session_state.default_heroes)
-            st.success("All heroes have been reset to their default stats.")
-        
-        # Download button to save hero stats settings
-        hero_stats_to_save = {
-            "heroes": {hero: stats.tolist() for hero, stats in st.session_state.heroes.items()},
-            "default_heroes": {hero: stats.tolist() for hero, stats in st.session_state.default_heroes.items()}
-        }
-        hero_stats_json = json.dumps(hero_stats_to_save)
+            st.session_state.hero_overrides = {}
+            heroes_changed()
+            st.toast("All heroes have been reset to their default stats.")
+
+        # Download button to save hero stats settings. Serialising every hero
+        # waits for a click; the callable runs on its own thread, so it gets a snapshot.
+        base, overrides = st.session_state.hero_base, dict(st.session_state.hero_overrides)
+        hero_stats_json = lambda: hero_settings_json(base, apply_overrides(base, overrides))  # noqa: E731
         st.download_button("Download Hero Stats", hero_stats_json, "hero_stats.json")
 
 # ----------------------------------------
-# Continue with Tier List Calculations & Display
+# Tier grid and chart. Each is a fragment nested in the tier list fragment,
+# so switching its display style reruns only that section, reusing the tier
+# list it was last drawn with.
 # ----------------------------------------
-heroes = st.session_state.heroes
-
-# Define the path to hero images (update the path accordingly)
-hero_images_path = "C:/Users/user/Desktop/MC_Code/MC_github/Marvel-Champions-Hero-Tier-List/images/heroes"
-hero_images = {}
-for hero in default_heroes.keys():
-    image_path = os.path.join(hero_images_path, f"{hero.replace(' ', '_').replace('.', '').replace('(', '').replace(')', '').lower()}.png")
-    if os.path.exists(image_path):
-        hero_images[hero] = Image.open(image_path)
+@st.fragment
+@profiled("tier_grid")
+def tier_grid(tier_members):
+    grid_mode = st.radio(
+        "Tier list style",
+        ["Cards", "Single image"],
+        horizontal=True,
+        key="grid_mode",
+        help="Single image draws the whole tier list as one picture, which updates faster while dragging sliders."
+    )
+    if grid_mode == "Single image":
+        st.image(render_tier_grid(tier_members), use_container_width=True)
     else:
-        hero_images[hero] = None
+        for tier, members in zip(TIERS, tier_members):
+            st.markdown(f"<h2>{tier}</h2>", unsafe_allow_html=True)
+            st.markdown(tier_grid_html(members), unsafe_allow_html=True)
+
+@st.fragment
+@profiled("score_chart")
+def score_chart(hero_names, tier_list, plot_title, chart_key):
+    chart_mode = st.radio(
+        "Chart style",
+        ["Image", "Interactive"],
+        horizontal=True,
+        key="chart_mode",
+        help="Interactive charts are drawn in your browser and load faster on slow connections."
+    )
+    if chart_mode == "Interactive":
+        st.altair_chart(score_chart_spec(hero_names, tier_list, plot_title), use_container_width=True)
+    else:
+        st.image(cached_score_chart(*chart_key, tuple(hero_names), plot_title, tier_list), use_container_width=True)
 
 # ----------------------------------------
-# Calculate Scores and Tiers using weighting and hero stats
+# Tier stability: how often each hero keeps its tier under nearby weightings.
+# A fragment, so turning it on reruns only this section.
 # ----------------------------------------
-def weight(hero_stats, weighting):
-    return np.dot(hero_stats, weighting)
-
-scores = {hero: weight(stats, weighting) for hero, stats in heroes.items()}
-sorted_scores = dict(sorted(scores.items(), key=lambda item: item[1]))
-
-hero_scores = np.array(list(scores.values()))
-mean_score = np.mean(hero_scores)
-std_score = np.std(hero_scores)
-threshold_S = mean_score + 1.5 * std_score
-threshold_A = mean_score + 0.5 * std_score
-threshold_B_lower = mean_score - 0.5 * std_score
-threshold_C = mean_score - 1.5 * std_score
-
-tiers = {"S": [], "A": [], "B": [], "C": [], "D": []}
-for hero, score in scores.items():
-    if score >= threshold_S:
-        tiers["S"].append((hero, score))
-    elif score >= threshold_A:
-        tiers["A"].append((hero, score))
-    elif score >= threshold_B_lower:
-        tiers["B"].append((hero, score))
-    elif score >= threshold_C:
-        tiers["C"].append((hero, score))
-    else:
-        tiers["D"].append((hero, score))
+@st.fragment
+@profiled("stability")
+def tier_stability_panel(weighting, roster_key, hero_matrix, hero_names, tier_list):
+    with st.expander("How stable are these tiers?"):
+        # Sampling thousands of weightings costs more than the rest of a rerun, so it waits to be asked for.
+        if not st.toggle("Check how stable the tiers are", key="show_stability"):
+            st.caption("Samples weightings near yours to find the heroes that sit close to a tier boundary.")
+            return
+        stability = cached_tier_stability(weighting, roster_key, hero_matrix)
+        st.markdown(
+            f"Each weight was nudged up and down by one, and {stability.n_samples:,} nearby weightings were sampled at random. "
+            "A hero with a low percentage sits close to a tier boundary."
+        )
+        kept = stability.stability()
+        order = np.argsort(kept, kind="stable")
+        st.dataframe(
+            {
+                "Hero": [hero_names[i] for i in order],
+                "Tier": [TIERS[tier_list.tier_of[i]] for i in order],
+                "Stays in tier": [f"{kept[i]:.0%}" for i in order],
+                **{f"% {tier}": [round(100 * stability.fractions[i, t]) for i in order] for t, tier in enumerate(TIERS)},
+            },
+            hide_index=True,
+            use_container_width=True
+        )
 
-for tier in tiers:
-    tiers[tier] = sorted(tiers[tier], key=lambda x: x[1], reverse=True)
+# ----------------------------------------
+# Inverse query: weightings that put a chosen hero in a chosen tier. A
+# fragment, so picking a hero or tier reruns only this section; applying a
+# suggestion repaints the page through the weighting dependency.
+# ----------------------------------------
+def apply_suggestion(values):
+    set_weighting(values)
+    set_preset_choice("Custom")
 
-hero_to_tier = {}
-for tier, heroes_list in tiers.items():
-    for hero, _ in heroes_list:
-        hero_to_tier[hero] = tier
+def show_suggestions(hero, tier, roster_key, hero_matrix):
+    names = st.session_state.hero_names
+    weighting = current_weighting()
+    suggestions = cached_weightings_for_tier(weighting_key(weighting), roster_key, names.index(hero), tier, hero_matrix)
+    if not suggestions:
+        st.markdown(f"No weighting near your current one puts {hero} in tier {tier}.")
+    elif suggestions[0].clicks == 0:
+        st.markdown(f"{hero} is already in tier {tier}.")
+    for n, suggestion in enumerate(suggestions):
+        if suggestion.clicks == 0:
+            continue
+        changes = ", ".join(
+            f"{STATS[i].name} {int(weighting[i])} \u2192 {int(suggestion.weighting[i])}"
+            for i in np.flatnonzero(suggestion.weighting != weighting)
+        )
+        st.markdown(f"**{suggestion.clicks} clicks:** {changes}")
+        st.button("Apply", key=f"apply_suggestion_{n}", on_click=apply_suggestion, args=(suggestion.weighting.tolist(),))
+
+@st.fragment
+@profiled("tier_finder")
+def tier_finder(roster_key, hero_matrix):
+    with st.expander("What would it take? Find weightings for a hero"):
+        names = st.session_state.hero_names
+        finder_col1, finder_col2 = st.columns(2)
+        with finder_col1:
+            # No hero is picked by default, so the search only runs once someone asks for one.
+            hero = st.selectbox("Hero", names, index=None, placeholder="Pick a hero", key="finder_hero")
+        with finder_col2:
+            tier = st.selectbox("Target tier", TIERS, key="finder_tier")
+        if hero is None:
+            st.caption("Pick a hero to see the smallest weighting changes that move them into the target tier.")
+        else:
+            show_suggestions(hero, tier, roster_key, hero_matrix)
+
+    rerun_if_changed("weighting", weighting_inputs())
 
 # ----------------------------------------
 # Add background image with custom CSS
 # ----------------------------------------
-background_image_url = "https://github.com/alechoward-lab/Marvel-Champions-Hero-Tier-List/blob/main/images/background/marvel_champions_background_image_v4.jpg?raw=true"
+background_image_url = hosted_image_url("https://github.com/alechoward-lab/Marvel-Champions-Hero-Tier-List/blob/main/images/background/marvel_champions_background_image_v4.jpg?raw=true")
 st.markdown(
     f"""
     <style>
@@ -476,6 +460,7 @@ st.markdown(
         background: url({background_image_url}) no-repeat center center fixed;
         background-size: cover;
     }}
+    {TIER_GRID_CSS}
     </style>
     """,
     unsafe_allow_html=True
@@ -514,46 +499,72 @@ st.markdown(
 # )
 
 # ----------------------------------------
-# Display Tier List with Images
+# The tier list. The editors and everything that depends on the weighting or
+# hero stats run as one fragment, so an edit reruns this section only, not
+# the banner, introduction and footer around it.
 # ----------------------------------------
-st.header(f"{plot_title}")
-
-tier_colors = {"S": "red", "A": "orange", "B": "green", "C": "blue", "D": "purple"}
-for tier in ["S", "A", "B", "C", "D"]:
-    st.markdown(f"<h2>{tier}</h2>", unsafe_allow_html=True)
-    num_cols = 5
-    rows = [tiers[tier][i:i + num_cols] for i in range(0, len(tiers[tier]), num_cols)]
-    for row in rows:
-        cols = st.columns(num_cols)
-        for idx, (hero, score) in enumerate(row):
-            with cols[idx]:
-                if hero in hero_image_urls:
-                    st.image(hero_image_urls[hero], use_container_width=True)
+@st.fragment
+@profiled("tier_list")
+def tier_list_section():
+    # ----------------------------------------
+    # Layout: Two columns side by side
+    # ----------------------------------------
+    col1, col2 = st.columns(2)
+    with col1:
+        weighting_editor()
+    with col2:
+        hero_editor()
+
+    # ----------------------------------------
+    # Calculate Scores and Tiers using weighting and hero stats
+    # ----------------------------------------
+    weighting = current_weighting()
+    plot_title = current_plot_title()
+    hero_names, hero_base, hero_base_key, hero_overrides, hero_overrides_key = current_roster()
+    roster_key = f"{hero_base_key}+{hero_overrides_key}" if hero_overrides else hero_base_key
+
+    # Serve the precomputed preset result when the session is on stock hero stats.
+    with stage("scoring"):
+        precomputed = None
+        if not hero_overrides and is_default_roster(hero_names, hero_base_key):
+            precomputed = precomputed_presets.get(weighting_key(weighting))
+
+        if precomputed is not None:
+            tier_list = precomputed.tier_list
+        else:
+            tier_list = cached_tier_list(weighting_key(weighting), hero_base_key, hero_overrides_key, hero_base, hero_overrides)
+
+    # ----------------------------------------
+    # Display Tier List with Images
+    # ----------------------------------------
+    st.header(f"{plot_title}")
+    tier_grid(tuple(tuple(hero_names[i] for i in tier_list.members[tier]) for tier in TIERS))
+
+    # ----------------------------------------
+    # Plotting
+    # ----------------------------------------
+    st.header("Hero Scores")
+    score_chart(hero_names, tier_list, plot_title, (weighting_key(weighting), roster_key))
+
+    hero_matrix = apply_overrides(hero_base, hero_overrides)
+    tier_stability_panel(weighting_key(weighting), roster_key, hero_matrix, hero_names, tier_list)
+
+    # Record the inputs before the finder draws: it compares against them to
+    # tell whether an applied suggestion needs the page repainted.
+    mark_rendered("weighting", weighting_inputs())
+    tier_finder(roster_key, hero_matrix)
+
+    # Keep the page URL in sync with the settings, so it can be bookmarked or shared.
+    url_params = {WEIGHTING_PARAM: encode_weighting(weighting)}
+    if hero_overrides and hero_base_key == DEFAULT_MATRIX_KEY:
+        url_params[OVERRIDES_PARAM] = encode_overrides(hero_overrides)
+    if debug_enabled():
+        url_params[DEBUG_PARAM] = "1"
+    if st.query_params.to_dict() != url_params:
+        st.query_params.from_dict(url_params)
+
+tier_list_section()
 
-# ----------------------------------------
-# Plotting
-# ----------------------------------------
-st.header("Hero Scores")
-sorted_hero_names = list(sorted_scores.keys())
-sorted_hero_scores = list(sorted_scores.values())
-bar_colors = [tier_colors[hero_to_tier[hero]] for hero in sorted_hero_names]
-
-fig, ax = plt.subplots(figsize=(14, 7), dpi=300)
-bars = ax.bar(sorted_hero_names, sorted_hero_scores, color=bar_colors)
-ax.set_ylabel("Scores", fontsize="x-large")
-ax.set_title(plot_title, fontweight='bold', fontsize=18)
-plt.xticks(rotation=45, ha='right')
-
-for label in ax.get_xticklabels():
-    hero = label.get_text()
-    if hero in hero_to_tier:
-        label.set_color(tier_colors[hero_to_tier[hero]])
-
-legend_handles = [Patch(color=tier_colors[tier], label=f"Tier {tier}") for tier in tier_colors]
-ax.legend(handles=legend_handles, title="Tier Colors", loc="upper left", fontsize='x-large', title_fontsize='x-large')
-plt.tight_layout()
-ax.grid(axis='y', linestyle='--', alpha=0.7)
-st.pyplot(fig)
 st.markdown("<hr>", unsafe_allow_html=True)
 
 st.markdown(
@@ -567,3 +578,6 @@ st.markdown(
 st.markdown("-Stay Zesty")
 st.markdown("<hr>", unsafe_allow_html=True)
 st.markdown("Most card images are from the Cerebro Discord bot developed by UnicornSnuggler. Thank you!")
+
+finish_run()
+debug_panel()
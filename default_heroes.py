@@ -1,4 +1,5 @@
 import numpy as np
+# Stat columns follow stat_schema.STATS.
                             #              e, t, cv,s, d, th,re,mi,c, s, br,lg,si,sc,mu
 default_heroes = {  
         "Captain Marvel":       np.array([ 5, 3,-1, 3, 4, 2, 4, 1, 0, 3, 0, 0, 5, 1, 1]),
@@ -0,0 +1,159 @@
+"""
+Export every preset and villain tier list without starting Streamlit.
+
+    python export_tier_lists.py exports
+    python export_tier_lists.py exports --formats json csv --workers 4
+
+Each tier list is written to <out>/presets/<name>.<ext> or
+<out>/villains/<name>.<ext> as JSON, CSV and a PNG score chart. Charts are
+rendered across a process pool. <out>/manifest.json records a content hash
+per output, so a rerun skips everything whose inputs have not changed and
+removes outputs for presets or villains that no longer exist.
+"""
+import argparse
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from charts import render_score_chart
+from preset_options import preset_options
+from scoring import HERO_MATRIX, HERO_NAMES, matrix_digest, score_heroes
+from tiers import TIERS, assign_tiers, tier_list_record
+from villain_scores import VILLAIN_MATRIX, VILLAIN_NAMES
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+FORMATS = ("json", "csv", "png")
+MANIFEST_NAME = "manifest.json"
+# Editing these changes how every chart looks, so they are part of each chart's hash.
+RENDER_SOURCES = ("charts.py", "tiers.py")
+
+
+def file_name(name):
+    """'Solo: No Rush' -> 'solo-no-rush'."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+
+
+def tier_list_jobs():
+    """(folder, name, title, weighting, TierList) for every preset and villain, scored in one matmul."""
+    entries = [("presets", name, name, np.asarray(weighting)) for name, weighting in preset_options.items()]
+    entries += [("villains", name, f"Heroes against {name}", VILLAIN_MATRIX[i]) for i, name in enumerate(VILLAIN_NAMES)]
+    all_scores = score_heroes(HERO_MATRIX, np.array([weighting for *_, weighting in entries]))
+    return [(*entry, assign_tiers(scores)) for entry, scores in zip(entries, all_scores)]
+
+
+def tier_list_json(name, weighting, tier_list):
+    return json.dumps({
+        "name": name,
+        "weighting": np.asarray(weighting).astype(int).tolist(),
+        **tier_list_record(tier_list, HERO_NAMES),
+    }, indent=1).encode()
+
+
+def tier_list_csv(tier_list):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["hero", "score", "tier"])
+    for i in np.argsort(-tier_list.scores, kind="stable"):
+        writer.writerow([HERO_NAMES[i], f"{tier_list.scores[i]:g}", TIERS[tier_list.tier_of[i]]])
+    return buffer.getvalue().encode()
+
+
+def _render_inputs_hash():
+    """Hash of everything besides the weighting and title that a chart depends on."""
+    h = hashlib.sha256(matrix_digest(HERO_MATRIX).encode() + json.dumps(HERO_NAMES).encode())
+    for source in RENDER_SOURCES:
+        with open(os.path.join(ROOT, source), "rb") as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _render(args):
+    title, tier_list = args
+    return render_score_chart(HERO_NAMES, tier_list, title)
+
+
+def _write(out_dir, path, content):
+    full_path = os.path.join(out_dir, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, "wb") as f:
+        f.write(content)
+
+
+def export_tier_lists(out_dir, formats=FORMATS, workers=None, force=False):
+    """Write every tier list to out_dir; returns (files written, files skipped, files removed)."""
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path) as f:
+            old_manifest = json.load(f)
+    except (OSError, ValueError):
+        old_manifest = {}
+
+    def unchanged(path, digest):
+        return not force and old_manifest.get(path) == digest and os.path.exists(os.path.join(out_dir, path))
+
+    manifest = {}
+    written = skipped = 0
+    charts = []
+    render_hash = _render_inputs_hash() if "png" in formats else None
+    for folder, name, title, weighting, tier_list in tier_list_jobs():
+        stem = f"{folder}/{file_name(name)}"
+        for fmt in formats:
+            path = f"{stem}.{fmt}"
+            if fmt == "png":
+                # Hash the inputs rather than the output, so unchanged charts are never rendered.
+                content = None
+                digest = hashlib.sha256(f"{render_hash}|{title}|{np.asarray(weighting).tolist()}".encode()).hexdigest()
+            else:
+                content = tier_list_json(name, weighting, tier_list) if fmt == "json" else tier_list_csv(tier_list)
+                digest = hashlib.sha256(content).hexdigest()
+            manifest[path] = digest
+            if unchanged(path, digest):
+                skipped += 1
+            elif content is None:
+                charts.append((path, title, tier_list))
+            else:
+                _write(out_dir, path, content)
+                written += 1
+
+    if charts:
+        # matplotlib is CPU-bound and single-threaded, so charts fan out across processes.
+        jobs = [(title, tier_list) for _, title, tier_list in charts]
+        if workers == 1 or len(charts) == 1:
+            images = [_render(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                images = list(pool.map(_render, jobs, chunksize=4))
+        for (path, _, _), png in zip(charts, images):
+            _write(out_dir, path, png)
+            written += 1
+
+    # Outputs in formats not exported this time are kept; anything else unlisted is stale.
+    for path, digest in old_manifest.items():
+        if path.rsplit(".", 1)[-1] not in formats:
+            manifest.setdefault(path, digest)
+    removed = 0
+    for path in set(old_manifest) - set(manifest):
+        if os.path.exists(os.path.join(out_dir, path)):
+            os.remove(os.path.join(out_dir, path))
+            removed += 1
+    os.makedirs(out_dir, exist_ok=True)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    return written, skipped, removed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export every preset and villain tier list as JSON, CSV and PNG.")
+    parser.add_argument("out_dir", help="output directory")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--workers", type=int, default=None, help="chart rendering processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="rewrite every output even if unchanged")
+    args = parser.parse_args()
+    written, skipped, removed = export_tier_lists(args.out_dir, tuple(args.formats), args.workers, args.force)
+    print(f"Wrote {written} files, skipped {skipped} unchanged, removed {removed} stale, in {args.out_dir}")
@@ -0,0 +1,35 @@
+"""
+Dependency tracking between dashboard fragments.
+
+Sections run as st.fragment, so interacting with them reruns only that
+section. When a nested section changes an input the rest of the tier list
+was drawn from (the tier finder applying a weighting), it reports the input
+here and a full rerun is requested only when the value differs from what the
+page was last drawn with.
+"""
+import streamlit as st
+
+_STATE_KEY = "_rendered_inputs"
+
+
+def _rendered():
+    if _STATE_KEY not in st.session_state:
+        st.session_state[_STATE_KEY] = {}
+    return st.session_state[_STATE_KEY]
+
+
+def mark_rendered(name, value):
+    """Record the input value the dependent sections were just drawn with."""
+    _rendered()[name] = value
+
+
+def rerun_if_changed(name, value):
+    """
+    Call at the end of a fragment: if `value` differs from what dependent
+    sections last rendered, rerun the whole app so they repaint.
+    """
+    rendered = _rendered()
+    if name in rendered and rendered[name] != value:
+        # Record first so the full rerun this triggers does not trigger another.
+        rendered[name] = value
+        st.rerun()
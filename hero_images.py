@@ -0,0 +1,64 @@
+"""
+Local hero card art from images/heroes.
+
+The directory is indexed once per process; images are decoded lazily on
+first use and kept in a process-wide cache shared by every session.
+"""
+import functools
+import os
+import re
+
+from default_heroes import default_heroes
+
+HERO_IMAGES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "images", "heroes")
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+# Heroes whose card art file is named differently from the hero.
+HERO_IMAGE_ALIASES = {
+    "Spider-Man Peter": "Spider-Man (Peter Parker)",
+    "Venom (Flash)": "Venom",
+}
+
+
+def hero_slug(name):
+    """'10_Doctor_Strange' and 'Doctor Strange' both become 'doctorstrange'."""
+    name = re.sub(r"^\d+_", "", name)
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def build_image_index(heroes=default_heroes, directory=HERO_IMAGES_DIR):
+    """Map hero names to card art paths by matching slugged file names."""
+    if not os.path.isdir(directory):
+        return {}
+    files = {}
+    for filename in os.listdir(directory):
+        stem, ext = os.path.splitext(filename)
+        if ext.lower() in IMAGE_EXTENSIONS:
+            files[hero_slug(stem)] = os.path.join(directory, filename)
+    index = {}
+    for hero in heroes:
+        path = files.get(hero_slug(HERO_IMAGE_ALIASES.get(hero, hero)))
+        if path is not None:
+            index[hero] = path
+    return index
+
+
+HERO_IMAGE_INDEX = build_image_index()
+
+
+def hero_image_path(hero):
+    """Path of a hero's card art, or None if there is no local image."""
+    return HERO_IMAGE_INDEX.get(hero)
+
+
+@functools.lru_cache(maxsize=64)
+def load_hero_image(hero):
+    """Decoded card art for a hero, or None. Callers must not mutate the result."""
+    path = hero_image_path(hero)
+    if path is None:
+        return None
+    from PIL import Image
+
+    image = Image.open(path)
+    image.load()  # decodes and releases the file handle
+    return image
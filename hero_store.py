@@ -0,0 +1,87 @@
+"""
+Columnar store of the default hero stats.
+
+default_heroes.py stays the file people edit. From it, `python hero_store.py`
+generates data/hero_stats.npy (one contiguous int8 matrix) and
+data/hero_names.json (row names plus a hash of the source file). The app
+memory-maps the matrix read-only, so every session and worker process shares
+the same pages. If default_heroes.py has changed since the files were
+generated, they are rebuilt on load. Rebuilds write new files and rename
+them into place, so processes that already mapped the old matrix keep it.
+"""
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+SOURCE_PATH = os.path.join(ROOT, "default_heroes.py")
+DATA_DIR = os.path.join(ROOT, "data")
+MATRIX_PATH = os.path.join(DATA_DIR, "hero_stats.npy")
+NAMES_PATH = os.path.join(DATA_DIR, "hero_names.json")
+
+
+def _source_hash():
+    with open(SOURCE_PATH, "rb") as f:
+        # Normalise line endings so checkouts on Windows and Linux agree.
+        return hashlib.sha256(f.read().replace(b"\r\n", b"\n")).hexdigest()
+
+
+def _stat_matrix():
+    """(names, int8 stat matrix) packed from default_heroes.py."""
+    from default_heroes import default_heroes
+
+    names = list(default_heroes.keys())
+    return names, np.array([default_heroes[name] for name in names], dtype=np.int8)
+
+
+def _replace_file(path, write):
+    """Call write(f) on a temporary file next to `path`, then rename it over `path`."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+def build_store():
+    """Write the matrix and name index generated from default_heroes.py."""
+    names, matrix = _stat_matrix()
+    index = json.dumps({"source_sha256": _source_hash(), "names": names}, indent=1).encode()
+    os.makedirs(DATA_DIR, exist_ok=True)
+    # Matrix first, name index last: an index carrying the new source hash
+    # always points at a matrix that is already complete.
+    _replace_file(MATRIX_PATH, lambda f: np.save(f, np.ascontiguousarray(matrix)))
+    _replace_file(NAMES_PATH, lambda f: f.write(index))
+    return names, matrix
+
+
+def load_store():
+    """(names, read-only int8 matrix), memory-mapped from the generated files."""
+    try:
+        with open(NAMES_PATH) as f:
+            index = json.load(f)
+        if index["source_sha256"] == _source_hash():
+            return index["names"], np.load(MATRIX_PATH, mmap_mode="r")
+    except (OSError, ValueError, KeyError):
+        pass
+    try:
+        build_store()
+        with open(NAMES_PATH) as f:
+            return json.load(f)["names"], np.load(MATRIX_PATH, mmap_mode="r")
+    except OSError:
+        # Read-only checkout: fall back to an in-memory matrix.
+        names, matrix = _stat_matrix()
+        matrix.setflags(write=False)
+        return names, matrix
+
+
+if __name__ == "__main__":
+    names, matrix = build_store()
+    print(f"Wrote {matrix.shape[0]} heroes x {matrix.shape[1]} stats to {MATRIX_PATH}")
@@ -0,0 +1,112 @@
+"""
+Find slider settings that put a hero in a chosen tier.
+
+A hero's tier depends on the weighting w only through its z-score
+(w . d) / sqrt(w' C w), where d is the hero's stats minus the roster mean and
+C is the roster's stat covariance: the cut-offs sit at mean + k * std and
+every score is linear in w. Both terms are evaluated in closed form for all
+30 one-click moves (+/- 1 on one slider) at once, so the search walks the
+integer slider grid towards the target tier instead of enumerating it.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from scoring import score_heroes
+from stat_schema import WEIGHT_RANGE
+from tiers import THRESHOLD_OFFSETS, TIERS, tier_indices
+
+
+class Suggestion(NamedTuple):
+    weighting: np.ndarray    # (15,) integer slider values
+    clicks: int              # total slider steps away from the starting weighting
+
+
+def _tier_bounds(tier):
+    """(low, high) z-score interval of a tier; low is inclusive."""
+    cutoffs = np.concatenate([[-np.inf], THRESHOLD_OFFSETS, [np.inf]])
+    t = len(TIERS) - 1 - TIERS.index(tier)
+    return cutoffs[t], cutoffs[t + 1]
+
+
+def _miss(weightings, d, cov, low, high):
+    """How far (in standard deviations) each weighting leaves the hero outside [low, high)."""
+    spread = np.sqrt(np.maximum(np.einsum("ki,ij,kj->k", weightings, cov, weightings), 0))
+    z = np.divide(weightings @ d, spread, out=np.zeros(len(weightings)), where=spread > 0)
+    return np.maximum(low - z, 0) + np.maximum(z - high + 1e-6, 0)
+
+
+def _moves(weighting):
+    """Every weighting one slider click away, within the slider range."""
+    steps = np.eye(len(weighting), dtype=int)
+    moves = np.vstack([weighting + steps, weighting - steps])
+    return moves[((moves >= WEIGHT_RANGE[0]) & (moves <= WEIGHT_RANGE[1])).all(axis=1)]
+
+
+def _descend(weighting, d, cov, low, high, max_clicks):
+    """Take the click that most reduces the miss until the hero is in range, or give up."""
+    miss = _miss(weighting[None].astype(float), d, cov, low, high)[0]
+    for _ in range(max_clicks):
+        if miss == 0:
+            return weighting
+        moves = _moves(weighting)
+        move_miss = _miss(moves.astype(float), d, cov, low, high)
+        best = int(np.argmin(move_miss))
+        if move_miss[best] >= miss:
+            return None
+        weighting, miss = moves[best], move_miss[best]
+    return weighting if miss == 0 else None
+
+
+def _tighten(weighting, start, d, cov, low, high):
+    """Undo clicks (step back towards `start`) wherever the hero stays in range."""
+    improved = True
+    while improved:
+        improved = False
+        for i in np.flatnonzero(weighting != start):
+            candidate = weighting.copy()
+            candidate[i] -= np.sign(weighting[i] - start[i])
+            if _miss(candidate[None].astype(float), d, cov, low, high)[0] == 0:
+                weighting, improved = candidate, True
+    return weighting
+
+
+def find_weightings(matrix, weighting, hero_row, tier, n_results=5, max_clicks=150):
+    """
+    Up to `n_results` integer weightings near `weighting` that put the hero in
+    row `hero_row` of `matrix` in `tier`, fewest slider clicks first.
+
+    Several searches are started, each with a different first click, so the
+    suggestions change different sliders. Every suggestion is checked against
+    the real tier assignment before it is returned. If the starting weighting
+    already puts the hero in `tier`, it is the only suggestion, at 0 clicks.
+    """
+    stats = np.asarray(matrix, dtype=np.float64)
+    start = np.asarray(weighting, dtype=int)
+    target = TIERS.index(tier)
+    # Checked on the real tiering: the z-score search sees a weighting with no
+    # spread (all zeros) as z = 0, whatever tier the hero actually lands in.
+    if tier_indices(score_heroes(matrix, start[None]))[0, hero_row] == target:
+        return [Suggestion(start, 0)]
+    d = stats[hero_row] - stats.mean(axis=0)
+    cov = np.cov(stats, rowvar=False, bias=True)
+    low, high = _tier_bounds(tier)
+
+    first_moves = _moves(start)
+    order = np.argsort(_miss(first_moves.astype(float), d, cov, low, high), kind="stable")
+    origins = [start] + [first_moves[i] for i in order[:3 * n_results]]
+    found = {}
+    for origin in origins:
+        result = _descend(origin, d, cov, low, high, max_clicks)
+        if result is not None:
+            result = _tighten(result, start, d, cov, low, high)
+            found[tuple(result.tolist())] = result
+
+    if not found:
+        return []
+    candidates = np.array(list(found.values()))
+    # Drop anything the float32 scoring path tiers differently at a boundary.
+    hits = tier_indices(score_heroes(matrix, candidates))[:, hero_row] == target
+    candidates = candidates[hits]
+    clicks = np.abs(candidates - start).sum(axis=1)
+    return [Suggestion(candidates[i], int(clicks[i])) for i in np.argsort(clicks, kind="stable")[:n_results]]
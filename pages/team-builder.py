@@ -0,0 +1,70 @@
+"""
+The team builder page: the best 2-4 hero teams for a weighting, found by a
+beam search (team_optimizer) running on a background thread.
+"""
+import streamlit as st
+
+from preset_options import preset_options
+from scoring import HERO_MATRIX, HERO_NAMES, apply_overrides, matrix_digest, weighting_key
+from team_optimizer import start_search
+from thumbnails import TIER_GRID_CSS, tier_grid_html
+
+st.markdown(f"<style>{TIER_GRID_CSS}</style>", unsafe_allow_html=True)
+
+st.title("Team Builder")
+st.markdown(
+    "Find the strongest multiplayer teams. A team scores well when its heroes are strong on their own "
+    "and when they cover each other's gaps: for every stat you value, the team gets credit for its best hero at it."
+)
+
+# ----------------------------------------
+# Inputs. "My current weighting" and any edited hero stats come from the main page.
+# ----------------------------------------
+CURRENT_WEIGHTING = "My current weighting"
+DEFAULT_PRESET = "Multiplayer: 3 Player"   # teams are for multiplayer; falls back to the first preset
+weighting_options = list(preset_options.keys())
+if "weighting" in st.session_state:
+    weighting_options.append(CURRENT_WEIGHTING)
+source = st.selectbox(
+    "Weighting",
+    weighting_options,
+    index=weighting_options.index(DEFAULT_PRESET) if DEFAULT_PRESET in weighting_options else 0,
+    key="team_weighting"
+)
+weighting = st.session_state.weighting if source == CURRENT_WEIGHTING else preset_options[source]
+
+team_size = st.slider("Team size", min_value=2, max_value=4, value=3, key="team_size")
+complementarity = st.slider(
+    "Gap coverage",
+    min_value=0.0,
+    max_value=1.0,
+    value=0.5,
+    step=0.05,
+    key="team_complementarity",
+    help="0 ranks teams only by their heroes' individual scores; 1 ranks them only by how well they cover every valued stat."
+)
+
+hero_names = st.session_state.get("hero_names", HERO_NAMES)
+hero_matrix = apply_overrides(st.session_state.get("hero_base", HERO_MATRIX), st.session_state.get("hero_overrides", {}))
+
+# ----------------------------------------
+# Search. Results are cached per weighting, hero stats and options for every session.
+# ----------------------------------------
+search_key = (weighting_key(weighting), matrix_digest(hero_matrix), team_size, complementarity)
+search = start_search(search_key, hero_matrix, weighting, team_size=team_size, top_k=5, complementarity=complementarity)
+
+if not search.done:
+    @st.fragment(run_every=0.2)
+    def wait_for_search():
+        if search.done:
+            st.rerun()
+        st.progress(search.progress, text="Searching teams...")
+
+    wait_for_search()
+elif search.error is not None:
+    st.error(f"The team search failed: {search.error}")
+else:
+    for rank, team in enumerate(search.result, start=1):
+        st.subheader(f"#{rank}: {', '.join(hero_names[i] for i in team.members)}")
+        st.caption(f"Team value {team.value:.1f}")
+        st.markdown(tier_grid_html([hero_names[i] for i in team.members]), unsafe_allow_html=True)
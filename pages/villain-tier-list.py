@@ -1,31 +1,49 @@
 """
-This will become the villain Tier List Page
-
-
+The villain tier list page: the stock hero roster ranked against a chosen
+villain, using the weightings in villain_weights.py.
 """
-
-# pages/About the Tier List.py
-
 import streamlit as st
 
-st.title("About the Tier List")
-st.markdown("""
-Welcome to the Living Marvel Champions Tier List!
-
-This project is built by **Daring Lime** to help players analyze and rank heroes
-based on a customizable scoring system. On this page, you can learn more about how
-scores are computed, how to contribute, or contact me via Discord or YouTube.
-
-If you have feedback or ideas for improvements, feel free to reach out!
-
-### Calculation Method
-Each hero is given scores in categories like:
-- **Economy**
-- **Tempo**
-- **Villain Damage**
-- *(etc.)*
-
-Your chosen weightings are applied to these categories to compute a final score.
-
----
-""")
+from pipeline import matchup_heatmap, villain_results
+from scoring import HERO_NAMES
+from thumbnails import TIER_GRID_CSS, hosted_image_url, tier_grid_html
+from tiers import TIERS
+from villain_image_urls import villain_image_urls
+from villain_scores import VILLAIN_NAMES
+from villain_strategies import villain_strategies
+
+st.markdown(f"<style>{TIER_GRID_CSS}</style>", unsafe_allow_html=True)
+
+st.title("Villain Tier List")
+st.markdown(
+    "Each villain rewards different hero strengths. Pick a villain to see how the heroes rank against them, "
+    "using the default hero stats and a weighting tuned for that villain."
+)
+
+villain = st.selectbox("Select a Villain", VILLAIN_NAMES, key="villain_choice")
+# Every villain's tier list is computed once per process, so switching is a lookup.
+tier_list = villain_results()[villain]
+
+col1, col2 = st.columns([1, 2])
+with col1:
+    if villain in villain_image_urls:
+        st.image(hosted_image_url(villain_image_urls[villain]), use_container_width=True)
+with col2:
+    st.subheader("Strategy")
+    st.markdown(villain_strategies.get(villain, ""))
+
+st.header(f"Heroes against {villain}")
+for tier in TIERS:
+    st.markdown(f"<h2>{tier}</h2>", unsafe_allow_html=True)
+    st.markdown(tier_grid_html([HERO_NAMES[i] for i in tier_list.members[tier]]), unsafe_allow_html=True)
+
+# ----------------------------------------
+# Matchup heatmap: every hero against every villain at once.
+# ----------------------------------------
+st.header("Hero vs. Villain Matchups")
+st.markdown(
+    "Each cell shows how a hero fares against a villain. Scores are measured in standard deviations from the "
+    "average hero for that villain, so villains can be compared side by side. Heroes are sorted best overall first."
+)
+color_by = st.radio("Color by", ["Score", "Tier"], horizontal=True, key="heatmap_color_by")
+st.vega_lite_chart(matchup_heatmap(color_by), use_container_width=True)
@@ -0,0 +1,99 @@
+"""
+Streamlit-cached entry points for the tier list pipeline.
+
+Results are keyed on the weighting vector and a digest of the hero matrix,
+so identical settings (the presets in particular) are only computed once per
+process no matter how many sessions ask for them. Tier lists and charts go
+through result_cache, which counts hits and can persist them to disk.
+"""
+import streamlit as st
+
+from charts import matchup_heatmap_spec, render_score_chart
+from inverse_query import find_weightings
+from preset_results import DEFAULT_MATRIX_KEY, build_preset_results, load_preset_charts
+from result_cache import RESULT_CACHE, settings_digest
+from scoring import HERO_NAMES, patch_scores, score_heroes
+from sensitivity import tier_stability
+from tiers import assign_tiers
+from villain_scores import VILLAIN_NAMES, normalized_score_matrix, villain_tier_lists, villain_tier_matrix
+
+
+@st.cache_data(max_entries=512, show_spinner=False)
+def cached_base_scores(weighting, matrix_key, _matrix):
+    """
+    Scores for a whole hero matrix, shared by every session on that matrix.
+
+    `weighting` must be hashable (a tuple) and `matrix_key` a digest of
+    `_matrix`; the matrix itself is excluded from Streamlit's hashing.
+    """
+    return score_heroes(_matrix, weighting)
+
+
+def cached_tier_list(weighting, matrix_key, overrides_key, matrix, overrides):
+    """
+    Tier a hero matrix with a session's sparse {row: stats} overrides applied.
+
+    Finished tier lists live in the process-wide result cache. On a miss the
+    base matrix is scored once per weighting for everyone and only the
+    overridden rows are re-scored for this session.
+    """
+    return RESULT_CACHE.get_or_compute(
+        settings_digest("tiers", weighting, matrix_key, overrides_key),
+        lambda: assign_tiers(patch_scores(cached_base_scores(weighting, matrix_key, matrix), overrides, weighting))
+    )
+
+
+def _chart_key(weighting, roster_key, names, title):
+    return settings_digest("chart", weighting, roster_key, "\x00".join(names), title)
+
+
+def cached_score_chart(weighting, roster_key, names, title, tier_list):
+    """
+    PNG bytes of the score chart, rendered once per unique weighting, hero
+    stats (`roster_key`), roster and title and kept in the result cache.
+    """
+    return RESULT_CACHE.get_or_compute(
+        _chart_key(weighting, roster_key, names, title),
+        lambda: render_score_chart(list(names), tier_list, title)
+    )
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def cached_tier_stability(weighting, roster_key, _matrix):
+    """Tier stability of a roster (`roster_key` digests `_matrix`) around a weighting."""
+    return tier_stability(_matrix, weighting)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_weightings_for_tier(weighting, roster_key, hero_row, tier, _matrix):
+    """Nearby weightings that put one hero of a roster in `tier`."""
+    return find_weightings(_matrix, weighting, hero_row, tier)
+
+
+@st.cache_resource(show_spinner=False)
+def preset_results():
+    """
+    Every preset scored and tiered against the stock roster, built once per
+    process. The committed preset charts go straight into the result cache,
+    so default visitors get them without matplotlib.
+    """
+    results = build_preset_results()
+    charts = load_preset_charts()
+    for weighting, result in results.items():
+        if result.name in charts:
+            key = _chart_key(weighting, DEFAULT_MATRIX_KEY, tuple(HERO_NAMES), result.name)
+            RESULT_CACHE.put(key, charts[result.name])
+    return results
+
+
+@st.cache_resource(show_spinner=False)
+def villain_results():
+    """Tier lists of the stock roster against every villain, built once per process."""
+    return villain_tier_lists()
+
+
+@st.cache_data(show_spinner=False)
+def matchup_heatmap(color_by):
+    """Vega-Lite spec of the stock roster x villain heatmap, built once per color mode."""
+    values = villain_tier_matrix() if color_by == "Tier" else normalized_score_matrix()
+    return matchup_heatmap_spec(HERO_NAMES, VILLAIN_NAMES, values, color_by)
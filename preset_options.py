@@ -1,4 +1,5 @@
 import numpy as np
+# Stat columns follow stat_schema.STATS.
 preset_options = {  #                                 e, t, cv,s, d, th,re,mi,c, su,br,lg,si,sc,mu
     "General Power: 2 Player":               np.array([4, 2, 2, 2, 1, 2, 2, 1, 2, 2, 2, 1, 0, 0, 1]),
     "Multiplayer: 3 Player":                 np.array([4, 1, 2, 2, 1, 5, 2, 3, 1, 7, 2, 5, 0, 0, 6]),
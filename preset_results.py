@@ -0,0 +1,92 @@
+"""
+Precomputed tier lists for the weighting presets.
+
+Nearly every visitor sits on one of the presets with the stock hero stats,
+so those score vectors and tiers are built once per process and served
+directly instead of being recomputed per session.
+
+Their charts are committed to data/preset_charts, so no worker has to load
+matplotlib for a default visitor. Run `python preset_results.py` after
+changing charts.py: each file name hashes the preset's title and weighting
+and the stock roster, so edits to presets or hero stats simply leave the
+charts unmatched (and rendered on first request) until the next rebuild.
+"""
+import argparse
+import hashlib
+import json
+import os
+from typing import NamedTuple
+
+import numpy as np
+
+from preset_options import preset_options
+from scoring import HERO_MATRIX, HERO_NAMES, matrix_digest, score_heroes, weighting_key
+from tiers import assign_tiers
+
+DEFAULT_MATRIX_KEY = matrix_digest(HERO_MATRIX)
+PRESET_CHART_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "preset_charts")
+
+
+class PresetResult(NamedTuple):
+    name: str
+    tier_list: object        # tiers.TierList
+
+
+def build_preset_results():
+    """Score every preset against the stock roster in one batched matmul."""
+    names = list(preset_options.keys())
+    all_scores = score_heroes(HERO_MATRIX, np.array(list(preset_options.values())))
+    results = {}
+    for name, scores in zip(names, all_scores):
+        results[weighting_key(preset_options[name])] = PresetResult(name, assign_tiers(scores))
+    return results
+
+
+def is_default_roster(names, matrix_key):
+    """True when a session's heroes are exactly the stock roster, in stock order."""
+    return matrix_key == DEFAULT_MATRIX_KEY and list(names) == HERO_NAMES
+
+
+# ----------------------------------------
+# Committed preset charts
+# ----------------------------------------
+def preset_chart_path(name, weighting):
+    """Where a preset's chart lives, named by a hash of everything it is drawn from besides the code."""
+    inputs = f"{DEFAULT_MATRIX_KEY}|{json.dumps(HERO_NAMES)}|{name}|{np.asarray(weighting).tolist()}"
+    h = hashlib.sha256(inputs.encode())
+    return os.path.join(PRESET_CHART_DIR, f"{h.hexdigest()[:16]}.png")
+
+
+def load_preset_charts():
+    """{preset name: PNG bytes} for every preset whose committed chart matches its current inputs."""
+    charts = {}
+    for name, weighting in preset_options.items():
+        try:
+            with open(preset_chart_path(name, weighting), "rb") as f:
+                charts[name] = f.read()
+        except OSError:
+            pass
+    return charts
+
+
+def build_preset_charts():
+    """Render every preset chart into PRESET_CHART_DIR and remove charts no preset uses; returns the paths kept."""
+    from charts import render_score_chart
+
+    os.makedirs(PRESET_CHART_DIR, exist_ok=True)
+    paths = set()
+    for result in build_preset_results().values():
+        path = preset_chart_path(result.name, preset_options[result.name])
+        with open(path, "wb") as f:
+            f.write(render_score_chart(HERO_NAMES, result.tier_list, result.name))
+        paths.add(path)
+    for file in os.listdir(PRESET_CHART_DIR):
+        if os.path.join(PRESET_CHART_DIR, file) not in paths:
+            os.remove(os.path.join(PRESET_CHART_DIR, file))
+    return paths
+
+
+if __name__ == "__main__":
+    argparse.ArgumentParser(description="Render the preset score charts into data/preset_charts.").parse_args()
+    paths = build_preset_charts()
+    print(f"Wrote {len(paths)} preset charts to {PRESET_CHART_DIR}")
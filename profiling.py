@@ -0,0 +1,173 @@
+"""
+Per-section timings of dashboard reruns.
+
+Sections are timed with `stage(name)` or the `profiled(name)` decorator
+(which also covers fragment reruns). After each full rerun the timings and
+the approximate session state size are shown in a debug panel when the page
+is opened with ?debug=1, and, if configured, exported:
+
+- PROFILE_LOG_PATH: one JSON record per rerun, appended.
+- PROFILE_METRICS_PATH: Prometheus text format, rewritten after each rerun
+  with process-wide totals (e.g. for node_exporter's textfile collector).
+"""
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+import streamlit as st
+
+from result_cache import RESULT_CACHE
+
+DEBUG_PARAM = "debug"
+LOG_PATH = os.environ.get("PROFILE_LOG_PATH")
+METRICS_PATH = os.environ.get("PROFILE_METRICS_PATH")
+
+_STATE_KEY = "_profile"
+_totals = {}                  # stage -> [count, seconds], for the whole process
+_last_state_bytes = 0
+_export_lock = threading.Lock()
+
+
+def _profile():
+    if _STATE_KEY not in st.session_state:
+        st.session_state[_STATE_KEY] = {"stages": {}, "open": False, "started": 0.0, "state_bytes": 0}
+    return st.session_state[_STATE_KEY]
+
+
+def start_run():
+    """Call first thing in the script: starts timing a full rerun."""
+    profile = _profile()
+    profile.update(stages={}, open=True, started=time.perf_counter())
+
+
+@contextmanager
+def stage(name):
+    """Time a section of the current run."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - started
+        profile = _profile()
+        profile["stages"][name] = seconds
+        if not profile["open"]:
+            # A fragment rerun: there is no full run to report it with.
+            _export("fragment", {name: seconds}, None)
+
+
+def profiled(name):
+    """Decorator form of `stage`, for fragments that also rerun on their own."""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def finish_run():
+    """Call at the end of the script: records the total and exports the run."""
+    profile = _profile()
+    profile["open"] = False
+    profile["stages"]["total"] = time.perf_counter() - profile["started"]
+    profile["state_bytes"] = session_state_bytes()
+    _export("full", dict(profile["stages"]), profile["state_bytes"])
+
+
+def _nbytes(value):
+    """Approximate memory held by a session state value. Memory-mapped arrays are shared, so count as 0."""
+    if isinstance(value, np.ndarray):
+        return 0 if isinstance(value, np.memmap) else value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_nbytes(k) + _nbytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def session_state_bytes():
+    return sum(_nbytes(st.session_state[key]) for key in st.session_state if key != _STATE_KEY)
+
+
+# ----------------------------------------
+# Export
+# ----------------------------------------
+def _export(kind, stages, state_bytes):
+    global _last_state_bytes
+    if not (LOG_PATH or METRICS_PATH):
+        return
+    with _export_lock:
+        for name, seconds in stages.items():
+            total = _totals.setdefault(name, [0, 0.0])
+            total[0] += 1
+            total[1] += seconds
+        if state_bytes is not None:
+            _last_state_bytes = state_bytes
+        try:
+            if LOG_PATH:
+                record = {"time": time.time(), "kind": kind, "stages": stages, "session_state_bytes": state_bytes}
+                with open(LOG_PATH, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+            if METRICS_PATH:
+                # Write then rename, so a scraper never reads a half-written file.
+                with open(METRICS_PATH + ".tmp", "w") as f:
+                    f.write(metrics_text())
+                os.replace(METRICS_PATH + ".tmp", METRICS_PATH)
+        except OSError:
+            pass  # profiling must never break the page
+
+
+def metrics_text():
+    """Process-wide totals in Prometheus text exposition format."""
+    lines = [
+        "# HELP tierlist_stage_seconds Time spent in each dashboard section.",
+        "# TYPE tierlist_stage_seconds summary",
+    ]
+    for name, (count, seconds) in sorted(_totals.items()):
+        lines.append(f'tierlist_stage_seconds_sum{{stage="{name}"}} {seconds:.6f}')
+        lines.append(f'tierlist_stage_seconds_count{{stage="{name}"}} {count}')
+    lines += [
+        "# HELP tierlist_session_state_bytes Approximate session state size after the last full rerun.",
+        "# TYPE tierlist_session_state_bytes gauge",
+        f"tierlist_session_state_bytes {_last_state_bytes}",
+        "# HELP tierlist_result_cache_total Result cache lookups by outcome.",
+        "# TYPE tierlist_result_cache_total counter",
+    ]
+    cache = RESULT_CACHE.stats()
+    for outcome, key in (("hit", "hits"), ("disk_hit", "disk_hits"), ("miss", "misses")):
+        lines.append(f'tierlist_result_cache_total{{outcome="{outcome}"}} {cache[key]}')
+    return "\n".join(lines) + "\n"
+
+
+# ----------------------------------------
+# Debug panel
+# ----------------------------------------
+def debug_enabled():
+    return st.query_params.get(DEBUG_PARAM) == "1"
+
+
+def debug_panel():
+    """The last run's section timings, shown only with ?debug=1."""
+    if not debug_enabled():
+        return
+    profile = _profile()
+    with st.expander("Debug: rerun profile", expanded=True):
+        st.dataframe(
+            {
+                "Section": list(profile["stages"]),
+                "Milliseconds": [round(seconds * 1000, 2) for seconds in profile["stages"].values()],
+            },
+            hide_index=True
+        )
+        cache = RESULT_CACHE.stats()
+        st.caption(
+            f"Session state: {profile['state_bytes'] / 1024:.1f} KB. "
+            f"Result cache: {cache['hits']} hits, {cache['disk_hits']} disk hits, {cache['misses']} misses, "
+            f"{cache['entries']} entries ({cache['bytes'] / 2**20:.1f} MB)."
+        )
@@ -0,0 +1,181 @@
+"""
+Process-wide cache of finished results: tier lists and rendered chart bytes.
+
+Entries are keyed by a canonical hash of the settings that produced them
+(weighting, hero stat digests and, for charts, roster names and title), so
+every session with the same settings gets the same entry. The in-memory tier
+is least-recently-used and bounded by size. If RESULT_CACHE_PATH names a
+SQLite file, entries are also written there and survive restarts. A hit in
+either tier does no numpy scoring or matplotlib rendering.
+"""
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from tiers import TIERS, TierList
+
+MAX_MEMORY_BYTES = 64 * 2**20
+MAX_DISK_ENTRIES = 10_000
+
+
+def settings_digest(kind, weighting, *parts):
+    """Canonical key: the kind of result, the weighting as float32 bytes, and any string parts."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(kind.encode())
+    h.update(np.asarray(weighting, dtype=np.float32).tobytes())
+    for part in parts:
+        h.update(b"\x00" + str(part).encode())
+    return f"{kind}:{h.hexdigest()}"
+
+
+def _freeze(tier_list):
+    """Make a shared TierList's arrays read-only, since every session gets the same object."""
+    for array in (tier_list.scores, tier_list.tier_of, *tier_list.members.values()):
+        array.setflags(write=False)
+    return tier_list
+
+
+def _size(value):
+    if isinstance(value, TierList):
+        return value.scores.nbytes + value.tier_of.nbytes + sum(m.nbytes for m in value.members.values())
+    return len(value)
+
+
+def _serialize(value):
+    if not isinstance(value, TierList):
+        return bytes(value)
+    buffer = io.BytesIO()
+    order = np.concatenate([value.members[tier] for tier in TIERS])
+    np.savez(buffer, scores=value.scores, tier_of=value.tier_of, order=order)
+    return buffer.getvalue()
+
+
+def _deserialize(kind, blob):
+    if kind != "tiers":
+        return blob
+    with np.load(io.BytesIO(blob), allow_pickle=False) as arrays:
+        scores, tier_of, order = arrays["scores"], arrays["tier_of"], arrays["order"]
+    ordered_tiers = tier_of[order]
+    members = {tier: order[ordered_tiers == t] for t, tier in enumerate(TIERS)}
+    return _freeze(TierList(scores, tier_of, members))
+
+
+class ResultCache:
+    """Size-bounded LRU of results with hit/miss counters and an optional SQLite tier."""
+
+    def __init__(self, max_bytes=MAX_MEMORY_BYTES, disk_path=None, max_disk_entries=MAX_DISK_ENTRIES):
+        self.max_bytes = max_bytes
+        self.disk_path = disk_path
+        self.max_disk_entries = max_disk_entries
+        self.hits = self.disk_hits = self.misses = 0
+        self._entries = OrderedDict()   # key -> (value, size)
+        self._pending = {}              # key -> Event set once the thread computing it is done
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if disk_path:
+            with self._connect() as db:
+                db.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB, used REAL)")
+
+    def get_or_compute(self, key, compute):
+        """The cached value for `key`, computing and storing it with `compute()` on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = threading.Event()
+        if pending is not None:
+            # Another thread is already computing this result: wait for it rather than repeat the work.
+            pending.wait()
+            return self.get_or_compute(key, compute)
+        try:
+            value = self._load(key)
+            if value is not None:
+                with self._lock:
+                    self.disk_hits += 1
+            else:
+                value = compute()
+                if isinstance(value, TierList):
+                    _freeze(value)
+                with self._lock:
+                    self.misses += 1
+                self._store(key, value)
+            self._remember(key, value)
+        finally:
+            with self._lock:
+                self._pending.pop(key).set()
+        return value
+
+    def put(self, key, value):
+        """Store a value produced elsewhere (a prebuilt chart) without counting a hit or a miss."""
+        if isinstance(value, TierList):
+            _freeze(value)
+        self._remember(key, value)
+
+    def stats(self):
+        """Counters and current size, for monitoring."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def _remember(self, key, value):
+        size = _size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._bytes -= self._entries.popitem(last=False)[1][1]
+
+    # ----------------------------------------
+    # SQLite tier. A connection per call keeps it safe across session threads.
+    # ----------------------------------------
+    def _connect(self):
+        return sqlite3.connect(self.disk_path, timeout=5)
+
+    def _load(self, key):
+        if not self.disk_path:
+            return None
+        try:
+            with self._connect() as db:
+                row = db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                db.execute("UPDATE results SET used = ? WHERE key = ?", (time.time(), key))
+            return _deserialize(key.split(":", 1)[0], row[0])
+        except (sqlite3.Error, ValueError, KeyError, OSError):
+            return None
+
+    def _store(self, key, value):
+        if not self.disk_path:
+            return
+        try:
+            with self._connect() as db:
+                db.execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)", (key, _serialize(value), time.time()))
+                db.execute(
+                    "DELETE FROM results WHERE key IN "
+                    "(SELECT key FROM results ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_disk_entries,)
+                )
+        except sqlite3.Error:
+            pass  # the disk tier is best effort; the in-memory result still stands
+
+
+RESULT_CACHE = ResultCache(disk_path=os.environ.get("RESULT_CACHE_PATH"))
@@ -0,0 +1,71 @@
+"""
+Vectorized hero scoring.
+
+Hero stats are packed into one contiguous (n_heroes x 15) matrix with a
+matching list of names, so a full roster is scored with a single matrix
+product instead of one np.dot per hero.
+"""
+import hashlib
+
+import numpy as np
+
+from hero_store import load_store
+
+
+def score_heroes(matrix, weighting):
+    """
+    Score every hero in one matmul.
+
+    A (15,) weighting returns an (n_heroes,) score vector; a (k, 15) batch of
+    weightings returns a (k, n_heroes) matrix, one row per weighting.
+    """
+    weighting = np.asarray(weighting, dtype=np.float32)
+    return weighting @ matrix.astype(np.float32, copy=False).T
+
+
+def weighting_key(weighting):
+    """Hashable cache key for a weighting vector."""
+    return tuple(np.asarray(weighting).tolist())
+
+
+def matrix_digest(matrix):
+    """Stable content hash of a stat matrix, used as a cache key."""
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    return hashlib.blake2b(repr(matrix.shape).encode() + matrix.tobytes(), digest_size=16).hexdigest()
+
+
+def overrides_digest(overrides):
+    """Stable hash of a {row: stat vector} override dict; '' when there are none."""
+    if not overrides:
+        return ""
+    h = hashlib.blake2b(digest_size=16)
+    for row in sorted(overrides):
+        h.update(int(row).to_bytes(4, "little"))
+        h.update(np.asarray(overrides[row], dtype=np.float32).tobytes())
+    return h.hexdigest()
+
+
+def apply_overrides(matrix, overrides):
+    """A full stat matrix with the overridden rows replaced."""
+    if not overrides:
+        return matrix
+    patched = np.array(matrix, dtype=np.float32)
+    for row, stats in overrides.items():
+        patched[row] = stats
+    return patched
+
+
+def patch_scores(scores, overrides, weighting):
+    """Re-score only the overridden rows of a precomputed score vector."""
+    if not overrides:
+        return scores
+    rows = np.fromiter(overrides.keys(), dtype=np.intp, count=len(overrides))
+    patched = np.array(scores, copy=True)
+    patched[rows] = score_heroes(np.array(list(overrides.values()), dtype=np.float32), weighting)
+    return patched
+
+
+# The stock roster: a read-only, memory-mapped int8 matrix shared by every
+# session in the process (and, through the page cache, across processes).
+HERO_NAMES, HERO_MATRIX = load_store()
+HERO_INDEX = {name: i for i, name in enumerate(HERO_NAMES)}
@@ -0,0 +1,49 @@
+"""
+How stable each hero's tier is under small changes to the weighting.
+
+The current weighting is nudged one weight at a time (+/- 1) and jittered at
+random; every nearby weighting is scored in a single (samples x 15) @
+(15 x heroes) matmul and tiered in one vectorized step, so thousands of
+samples take milliseconds.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+from scoring import score_heroes
+from stat_schema import WEIGHT_RANGE
+from tiers import TIERS, tier_indices
+
+
+class TierStability(NamedTuple):
+    tier_of: np.ndarray      # (n_heroes,) tier index under the current weighting
+    fractions: np.ndarray    # (n_heroes, len(TIERS)) share of nearby weightings per tier
+    n_samples: int
+
+    def stability(self):
+        """(n_heroes,) share of nearby weightings that keep each hero in its current tier."""
+        return self.fractions[np.arange(len(self.tier_of)), self.tier_of]
+
+
+def nearby_weightings(weighting, n_samples=2000, spread=1.0, seed=0):
+    """
+    A (samples x 15) batch of weightings around `weighting`: each weight
+    moved by +/- 1 on its own, plus `n_samples` with Gaussian noise of
+    standard deviation `spread` on every weight, clipped to the slider range.
+    """
+    weighting = np.asarray(weighting, dtype=np.float32)
+    steps = np.eye(len(weighting), dtype=np.float32)
+    one_at_a_time = np.vstack([weighting + steps, weighting - steps])
+    noise = np.random.default_rng(seed).normal(0, spread, (n_samples, len(weighting))).astype(np.float32)
+    return np.clip(np.vstack([one_at_a_time, weighting + noise]), *WEIGHT_RANGE)
+
+
+def tier_stability(matrix, weighting, n_samples=2000, spread=1.0, seed=0):
+    """Tier distribution of every hero across weightings near `weighting`."""
+    samples = nearby_weightings(weighting, n_samples, spread, seed)
+    tiers = tier_indices(score_heroes(matrix, samples))     # (samples, n_heroes)
+    n_heroes = tiers.shape[1]
+    counts = np.bincount((np.arange(n_heroes) * len(TIERS) + tiers).ravel(), minlength=n_heroes * len(TIERS))
+    fractions = counts.reshape(n_heroes, len(TIERS)) / len(samples)
+    current = tier_indices(score_heroes(matrix, weighting))
+    return TierStability(current, fractions, len(samples))
@@ -0,0 +1,154 @@
+"""
+Reading and writing the weighting and hero stat settings files.
+
+Uploads are untrusted: they are size-capped before parsing, read in a single
+bounded read, and checked against a strict schema (known keys and hero names,
+15-length integer vectors in range) before anything is allocated or written
+to session state. Parsing returns a typed settings object or raises
+SettingsError with a message fit to show the user.
+"""
+import json
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from preset_options import preset_options
+from scoring import HERO_INDEX, HERO_MATRIX, HERO_NAMES
+from stat_schema import HERO_STAT_RANGE, N_STATS, STATS, UPLOAD_KEY_MAP, WEIGHT_RANGE
+
+MAX_WEIGHTING_BYTES = 16 * 1024
+MAX_HERO_STATS_BYTES = 256 * 1024
+
+
+class SettingsError(ValueError):
+    """An uploaded settings file was rejected."""
+
+
+class WeightingSettings(NamedTuple):
+    weighting: np.ndarray            # (15,) ints in WEIGHT_RANGE
+    preset_choice: Optional[str]     # a preset name, "Custom", or None if the file has none
+
+
+class HeroSettings(NamedTuple):
+    base: Optional[np.ndarray]       # (n_heroes, 15) int8 base in HERO_NAMES order; None for the stock stats
+    overrides: dict                  # row -> (15,) int8 stats that differ from the base
+
+
+def _read_json(uploaded, max_bytes):
+    """Parse an uploaded file (anything with .read) of at most max_bytes."""
+    if getattr(uploaded, "size", 0) > max_bytes:
+        raise SettingsError(f"The file is too large (limit {max_bytes // 1024} KB).")
+    data = uploaded.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise SettingsError(f"The file is too large (limit {max_bytes // 1024} KB).")
+
+    def reject_constant(name):
+        raise SettingsError(f"{name} is not a valid stat value.")
+
+    try:
+        settings = json.loads(data, parse_constant=reject_constant)
+    except (ValueError, RecursionError) as error:
+        if isinstance(error, SettingsError):
+            raise
+        raise SettingsError("The file is not valid JSON.") from None
+    if not isinstance(settings, dict):
+        raise SettingsError("The file must contain a JSON object.")
+    return settings
+
+
+def _int_value(value, value_range, what):
+    """Validate one whole number in value_range (older files may store 3 as 3.0)."""
+    if (
+        isinstance(value, bool) or not isinstance(value, (int, float))
+        or not value_range[0] <= value <= value_range[1] or value != int(value)
+    ):
+        raise SettingsError(f"{what}: {value!r} is not a whole number from {value_range[0]} to {value_range[1]}.")
+    return int(value)
+
+
+def _int_vector(values, value_range, what):
+    """Validate a list of N_STATS whole numbers in value_range."""
+    if not isinstance(values, list) or len(values) != N_STATS:
+        raise SettingsError(f"{what} must be a list of {N_STATS} numbers.")
+    return [_int_value(value, value_range, what) for value in values]
+
+
+def parse_weighting_settings(uploaded, current_weighting):
+    """
+    Read a weighting settings file. Individual stat keys (display names or
+    short keys) override `current_weighting`; a "weighting" list, if present,
+    replaces it. Unrecognized keys are ignored.
+    """
+    settings = _read_json(uploaded, MAX_WEIGHTING_BYTES)
+    weighting = [int(v) for v in current_weighting]
+    stat_index = {stat.name: i for i, stat in enumerate(STATS)}
+    for file_key, value in settings.items():
+        name = UPLOAD_KEY_MAP.get(file_key, file_key)
+        if name in stat_index:
+            weighting[stat_index[name]] = _int_value(value, WEIGHT_RANGE, f"'{file_key}'")
+    if "weighting" in settings:
+        weighting = _int_vector(settings["weighting"], WEIGHT_RANGE, "'weighting'")
+
+    preset_choice = settings.get("preset_choice")
+    if preset_choice is not None and not isinstance(preset_choice, str):
+        raise SettingsError("'preset_choice' must be a preset name.")
+    if preset_choice is not None and preset_choice != "Custom" and preset_choice not in preset_options:
+        raise SettingsError("'preset_choice' is not a known preset.")
+    return WeightingSettings(np.array(weighting, dtype=int), preset_choice)
+
+
+def _hero_rows(heroes, what):
+    """Validate a {hero name: stats} object into {row: int8 stats}."""
+    if not isinstance(heroes, dict):
+        raise SettingsError(f"'{what}' must map hero names to stats.")
+    unknown = [name for name in heroes if name not in HERO_INDEX]
+    if unknown:
+        raise SettingsError(f"'{what}' has unknown heroes: {', '.join(map(str, unknown[:5]))}.")
+    return {
+        HERO_INDEX[name]: np.array(_int_vector(stats, HERO_STAT_RANGE, f"{name}'s stats"), dtype=np.int8)
+        for name, stats in heroes.items()
+    }
+
+
+def parse_hero_settings(uploaded):
+    """
+    Read a hero stats file. "default_heroes" becomes the base (heroes it
+    leaves out keep their stock stats) and "heroes" the edits on top of it.
+    """
+    settings = _read_json(uploaded, MAX_HERO_STATS_BYTES)
+    if "default_heroes" not in settings and "heroes" not in settings:
+        raise SettingsError("The file has no 'heroes' or 'default_heroes' entry.")
+
+    base = None
+    base_rows = _hero_rows(settings.get("default_heroes", {}), "default_heroes")
+    changed = {row: stats for row, stats in base_rows.items() if not np.array_equal(stats, HERO_MATRIX[row])}
+    if changed:
+        base = np.array(HERO_MATRIX, dtype=np.int8)
+        for row, stats in changed.items():
+            base[row] = stats
+        base.setflags(write=False)
+
+    reference = HERO_MATRIX if base is None else base
+    overrides = {
+        row: stats
+        for row, stats in _hero_rows(settings.get("heroes", {}), "heroes").items()
+        if not np.array_equal(stats, reference[row])
+    }
+    return HeroSettings(base, overrides)
+
+
+def weighting_settings_json(preset_choice, weighting):
+    """The downloadable weighting settings file."""
+    return json.dumps({
+        "preset_choice": preset_choice,
+        **{stat.name: int(value) for stat, value in zip(STATS, weighting)},
+        "weighting": [int(value) for value in weighting],
+    })
+
+
+def hero_settings_json(base, stats):
+    """The downloadable hero stats file: the base and the edited stats, by hero name."""
+    return json.dumps({
+        "heroes": dict(zip(HERO_NAMES, np.asarray(stats).astype(int).tolist())),
+        "default_heroes": dict(zip(HERO_NAMES, np.asarray(base).astype(int).tolist())),
+    })
@@ -0,0 +1,48 @@
+"""
+The 15 hero stats, in the column order used by default_heroes, preset_options
+and villain_weights.
+
+Sliders, hero stat inputs, presets, uploads and downloads are all generated
+from STATS, so adding a stat means adding a row here (and a column to the
+data files) rather than touching every widget.
+"""
+from typing import NamedTuple
+
+from help_tips import help_tips
+
+
+class Stat(NamedTuple):
+    name: str        # display name, slider key and key in downloaded settings
+    key: str         # short key accepted in uploaded settings files
+    help: str
+
+
+WEIGHT_RANGE = (-10, 10)
+HERO_STAT_RANGE = (-10, 10)
+
+STATS = tuple(
+    Stat(name, key, help_tips[name])
+    for name, key in [
+        ("Economy", "economy"),
+        ("Tempo", "tempo"),
+        ("Card Value", "card_value"),
+        ("Survivability", "survivability"),
+        ("Villain Damage", "villain_damage"),
+        ("Threat Removal", "threat_removal"),
+        ("Reliability", "reliability"),
+        ("Minion Control", "minion_control"),
+        ("Control Boon", "control"),
+        ("Support Boon", "support"),
+        ("Unique Broken Builds Boon", "unique_builds"),
+        ("Late Game Power Boon", "late_game"),
+        ("Simplicity", "simplicity"),
+        ("Stun/Confuse Boon", "status_cards"),
+        ("Multiplayer Consistency Boon", "multiplayer_consistency"),
+    ]
+)
+
+STAT_NAMES = [stat.name for stat in STATS]
+N_STATS = len(STATS)
+
+# Uploaded settings may use either the short keys or the display names.
+UPLOAD_KEY_MAP = {stat.key: stat.name for stat in STATS}
@@ -0,0 +1,132 @@
+"""
+Best 2-4 hero teams for a weighting.
+
+A team's value is a blend of how strong its heroes are on their own (their
+mean weighted score) and how well they cover each other's gaps (for every
+positively weighted stat, the best value any member has, weighted). The
+search is a beam search: teams grow one hero at a time and every extension
+of every team in the beam is scored in a single vectorized step, so even
+4-hero teams from the full roster (~455k combinations) take milliseconds.
+"""
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import numpy as np
+
+from scoring import score_heroes
+
+
+class Team(NamedTuple):
+    members: tuple   # hero row indices, ascending
+    value: float
+
+
+def candidate_heroes(matrix, weighting, max_candidates=40, specialists_per_stat=3):
+    """
+    Prune the roster to heroes that can plausibly appear in a top team: the
+    strongest overall plus the best few at each positively weighted stat.
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    weighting = np.asarray(weighting, dtype=np.float32)
+    scores = score_heroes(matrix, weighting)
+    keep = set(np.argsort(-scores, kind="stable")[:max_candidates].tolist())
+    for stat in np.flatnonzero(weighting > 0):
+        keep.update(np.argsort(-matrix[:, stat], kind="stable")[:specialists_per_stat].tolist())
+    return np.array(sorted(keep), dtype=np.intp)
+
+
+def search_teams(matrix, weighting, team_size=3, top_k=10, beam_width=256, complementarity=0.5, progress=None):
+    """
+    Return the top_k Teams of `team_size` heroes, best first.
+
+    `complementarity` (0..1) trades individual strength for gap coverage.
+    `progress`, if given, is called with a fraction in [0, 1] after each step.
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    weighting = np.asarray(weighting, dtype=np.float32)
+    candidates = candidate_heroes(matrix, weighting)
+    team_size = min(team_size, len(candidates))
+    stats = matrix[candidates]
+    scores = score_heroes(stats, weighting)
+    coverage_weights = np.clip(weighting, 0, None)
+
+    # Beam state: member positions into `candidates`, summed scores, per-stat best.
+    members = np.arange(len(candidates))[:, None]
+    score_sums = scores.copy()
+    best_stats = stats.copy()
+    for size in range(2, team_size + 1):
+        # Extend every team by every candidate with a higher position, so each
+        # combination is generated exactly once.
+        new_sums = score_sums[:, None] + scores[None, :]
+        new_best = np.maximum(best_stats[:, None, :], stats[None, :, :])
+        valid = np.arange(len(candidates))[None, :] > members[:, -1:]
+        values = _team_value(new_sums / size, new_best @ coverage_weights, complementarity)
+        values = np.where(valid, values, -np.inf)
+
+        flat = values.ravel()
+        keep = min(beam_width if size < team_size else top_k, int(valid.sum()))
+        chosen = np.argpartition(-flat, keep - 1)[:keep]
+        rows, cols = np.unravel_index(chosen, values.shape)
+        members = np.hstack([members[rows], cols[:, None]])
+        score_sums = new_sums[rows, cols]
+        best_stats = new_best[rows, cols]
+        if progress is not None:
+            progress((size - 1) / (team_size - 1))
+
+    values = _team_value(score_sums / team_size, best_stats @ coverage_weights, complementarity)
+    order = np.argsort(-values, kind="stable")[:top_k]
+    return [Team(tuple(candidates[members[i]].tolist()), float(values[i])) for i in order]
+
+
+def _team_value(mean_scores, coverage, complementarity):
+    return (1 - complementarity) * mean_scores + complementarity * coverage
+
+
+# ----------------------------------------
+# Background searches, shared by every session in the process.
+# ----------------------------------------
+class TeamSearch:
+    """A search running on a background thread; poll `progress` and `result`."""
+
+    def __init__(self, *args, **kwargs):
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self._thread = threading.Thread(target=self._run, args=args, kwargs=kwargs, daemon=True)
+        self._thread.start()
+
+    def _run(self, *args, **kwargs):
+        try:
+            self.result = search_teams(*args, progress=self._set_progress, **kwargs)
+        except Exception as error:  # surfaced to the page instead of dying silently
+            self.error = error
+        self.progress = 1.0
+
+    def _set_progress(self, fraction):
+        self.progress = fraction
+
+    @property
+    def done(self):
+        return not self._thread.is_alive()
+
+
+_searches = OrderedDict()
+_searches_lock = threading.Lock()
+MAX_CACHED_SEARCHES = 256
+
+
+def start_search(key, matrix, weighting, **options):
+    """
+    Start (or reuse) the background search cached under `key`, which must
+    identify the hero stats, weighting and options.
+    """
+    with _searches_lock:
+        search = _searches.get(key)
+        if search is None or search.error is not None:
+            search = TeamSearch(matrix, weighting, **options)
+            _searches[key] = search
+        _searches.move_to_end(key)
+        while len(_searches) > MAX_CACHED_SEARCHES:
+            _searches.popitem(last=False)
+        return search
@@ -0,0 +1,6 @@
+"""The app's modules live at the repository root, next to this folder."""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
@@ -0,0 +1,15 @@
+"""The committed preset charts must match the current presets and hero stats."""
+import os
+
+from preset_options import preset_options
+from preset_results import PRESET_CHART_DIR, load_preset_charts, preset_chart_path
+
+
+def test_every_preset_has_a_current_chart():
+    missing = sorted(set(preset_options) - set(load_preset_charts()))
+    assert not missing, f"Run `python preset_results.py`: no current chart for {missing}"
+
+
+def test_no_stale_charts():
+    current = {os.path.basename(preset_chart_path(name, weighting)) for name, weighting in preset_options.items()}
+    assert set(os.listdir(PRESET_CHART_DIR)) == current
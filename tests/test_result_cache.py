@@ -0,0 +1,18 @@
+from result_cache import ResultCache
+
+
+def test_put_does_not_count():
+    cache = ResultCache()
+    cache.put("chart:a", b"png")
+    assert cache.stats()["misses"] == 0
+    assert cache.get_or_compute("chart:a", lambda: b"other") == b"png"
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 0)
+
+
+def test_miss_computes_once():
+    cache = ResultCache()
+    calls = []
+    for _ in range(3):
+        cache.get_or_compute("chart:b", lambda: calls.append(1) or b"png")
+    assert len(calls) == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (2, 1)
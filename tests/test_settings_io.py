@@ -0,0 +1,82 @@
+"""
+Malformed settings uploads must be rejected with SettingsError.
+
+The dashboard only catches SettingsError around the upload parsers, so any
+other exception from a bad file takes down the editor. Each case below is a
+file a user could upload.
+"""
+import io
+import json
+
+import numpy as np
+import pytest
+
+from preset_options import preset_options
+from scoring import HERO_MATRIX, HERO_NAMES
+from settings_io import (
+    MAX_HERO_STATS_BYTES, MAX_WEIGHTING_BYTES, SettingsError, hero_settings_json, parse_hero_settings,
+    parse_weighting_settings, weighting_settings_json
+)
+from stat_schema import N_STATS
+
+WEIGHTING = np.array(next(iter(preset_options.values())))
+
+
+def upload(content):
+    return io.BytesIO(content if isinstance(content, bytes) else json.dumps(content).encode())
+
+
+BAD_WEIGHTING_FILES = {
+    "not JSON": b"{",
+    "NaN": b'{"Economy": NaN}',
+    "top-level list": [1, 2, 3],
+    "deep nesting": b"[" * 100_000 + b"]" * 100_000,
+    "too large": b" " * (MAX_WEIGHTING_BYTES + 1),
+    "stat out of range": {"Economy": 99},
+    "fractional stat": {"Economy": 1.5},
+    "boolean stat": {"Economy": True},
+    "string stat": {"Economy": "3"},
+    "short weighting": {"weighting": [1] * (N_STATS - 1)},
+    "weighting not a list": {"weighting": "1,2,3"},
+    "unknown preset": {"preset_choice": "No such preset"},
+    "list preset": {"preset_choice": ["x"]},
+    "object preset": {"preset_choice": {"a": 1}},
+    "number preset": {"preset_choice": 3},
+}
+
+BAD_HERO_FILES = {
+    "not JSON": b"not json",
+    "top-level list": [],
+    "too large": b" " * (MAX_HERO_STATS_BYTES + 1),
+    "no hero entries": {"something": 1},
+    "heroes not an object": {"heroes": [1, 2]},
+    "unknown hero": {"heroes": {"Nobody": [0] * N_STATS}},
+    "short stats": {"heroes": {HERO_NAMES[0]: [0] * (N_STATS - 1)}},
+    "stat out of range": {"heroes": {HERO_NAMES[0]: [11] * N_STATS}},
+    "stats not a list": {"default_heroes": {HERO_NAMES[0]: {"Economy": 1}}},
+}
+
+
+@pytest.mark.parametrize("content", BAD_WEIGHTING_FILES.values(), ids=BAD_WEIGHTING_FILES)
+def test_bad_weighting_file_rejected(content):
+    with pytest.raises(SettingsError):
+        parse_weighting_settings(upload(content), WEIGHTING)
+
+
+@pytest.mark.parametrize("content", BAD_HERO_FILES.values(), ids=BAD_HERO_FILES)
+def test_bad_hero_file_rejected(content):
+    with pytest.raises(SettingsError):
+        parse_hero_settings(upload(content))
+
+
+def test_weighting_download_round_trips():
+    preset = next(iter(preset_options))
+    settings = parse_weighting_settings(upload(weighting_settings_json(preset, WEIGHTING).encode()), WEIGHTING)
+    assert settings.preset_choice == preset
+    assert np.array_equal(settings.weighting, WEIGHTING)
+
+
+def test_stock_hero_download_round_trips():
+    heroes = parse_hero_settings(upload(hero_settings_json(HERO_MATRIX, HERO_MATRIX).encode()))
+    assert heroes.base is None
+    assert not heroes.overrides
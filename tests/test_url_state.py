@@ -0,0 +1,102 @@
+"""
+Settings shared through the page URL. The ?w= and ?h= values come from
+whoever wrote the link, so anything malformed must raise ValueError (which
+the dashboard turns into a toast) rather than crash or load bad stats.
+"""
+import base64
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from scoring import HERO_NAMES
+from stat_schema import HERO_STAT_RANGE, N_STATS, WEIGHT_RANGE
+from url_state import decode_overrides, decode_weighting, encode_overrides, encode_weighting
+
+N_HEROES = len(HERO_NAMES)
+RECORD = struct.Struct(f"<H{N_STATS}b")
+
+
+def b64(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def records(*rows, stat=1):
+    return b"".join(RECORD.pack(row, *[stat] * N_STATS) for row in rows)
+
+
+@pytest.mark.parametrize("weighting", [
+    [WEIGHT_RANGE[0]] * N_STATS,
+    [WEIGHT_RANGE[1]] * N_STATS,
+    [0] * N_STATS,
+    list(range(-7, -7 + N_STATS)),
+])
+def test_weighting_round_trips(weighting):
+    text = encode_weighting(weighting)
+    assert len(text) == 12
+    assert decode_weighting(text).tolist() == weighting
+
+
+def test_overrides_round_trip():
+    rng = np.random.default_rng(0)
+    for n_edits in (1, 5, N_HEROES):
+        rows = rng.choice(N_HEROES, n_edits, replace=False)
+        overrides = {int(row): rng.integers(HERO_STAT_RANGE[0], HERO_STAT_RANGE[1] + 1, N_STATS) for row in rows}
+        decoded = decode_overrides(encode_overrides(overrides), N_HEROES)
+        assert sorted(decoded) == sorted(overrides)
+        assert all(np.array_equal(decoded[row], overrides[row]) for row in overrides)
+
+
+def test_no_overrides_is_empty():
+    assert encode_overrides({}) == ""
+    assert decode_overrides("", N_HEROES) == {}
+
+
+VALID_W = encode_weighting([0] * N_STATS)
+
+BAD_WEIGHTINGS = {
+    "empty": "",
+    "not base64": "!" * 12,
+    "stray character": VALID_W[:4] + "!" + VALID_W[4:],
+    "padding": VALID_W + "==",
+    "standard base64 alphabet": "+" * 12,
+    "too short": VALID_W[:8],
+    "too long": VALID_W + "AAAA",
+    "value out of range": b64(b"\xff" * 9),
+}
+
+BAD_OVERRIDES = {
+    "not base64": "%%%",
+    "unknown encoding": b64(b"\x02" + records(0)),
+    "only a prefix": b64(b"\x00"),
+    "partial record": b64(b"\x00" + records(0)[:-1]),
+    "row outside roster": b64(b"\x00" + records(N_HEROES)),
+    "stat out of range": b64(b"\x00" + records(0, stat=HERO_STAT_RANGE[1] + 1)),
+    "duplicate row": b64(b"\x00" + records(3, 3)),
+    "rows out of order": b64(b"\x00" + records(4, 3)),
+    "more records than heroes": b64(b"\x00" + records(*range(N_HEROES + 1))),
+    "corrupt zlib": b64(b"\x01" + b"not zlib data"),
+    "zlib bomb": b64(b"\x01" + zlib.compress(b"\x00" * 50_000_000, 9)),
+}
+
+
+@pytest.mark.parametrize("text", BAD_WEIGHTINGS.values(), ids=BAD_WEIGHTINGS)
+def test_bad_weighting_rejected(text):
+    with pytest.raises(ValueError):
+        decode_weighting(text)
+
+
+@pytest.mark.parametrize("text", BAD_OVERRIDES.values(), ids=BAD_OVERRIDES)
+def test_bad_overrides_rejected(text):
+    with pytest.raises(ValueError):
+        decode_overrides(text, N_HEROES)
+
+
+def test_encoders_reject_out_of_range_values():
+    with pytest.raises(ValueError):
+        encode_weighting([WEIGHT_RANGE[1] + 1] * N_STATS)
+    with pytest.raises(ValueError):
+        encode_weighting([0] * (N_STATS - 1))
+    with pytest.raises(ValueError):
+        encode_overrides({0: [HERO_STAT_RANGE[0] - 1] * N_STATS})
@@ -0,0 +1,144 @@
+"""
+Resized hero card thumbnails served from Streamlit's static folder.
+
+Run `python thumbnails.py` after adding or changing art in images/heroes. It
+writes content-hashed thumbnails at a few widths to static/thumbnails and a
+manifest mapping hero names to them. Because every file name carries a hash
+of its bytes, the files never change in place and can be cached indefinitely
+by browsers and any proxy in front of the app.
+"""
+import argparse
+import hashlib
+import html
+import io
+import json
+import os
+from urllib.parse import urlsplit
+
+from hero_image_urls import hero_image_urls
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+THUMBNAIL_DIR = os.path.join(STATIC_DIR, "thumbnails")
+MANIFEST_PATH = os.path.join(THUMBNAIL_DIR, "manifest.json")
+STATIC_URL = "app/static"
+# When set (e.g. http://127.0.0.1:8700), hosted images are requested from this
+# server instead of imgur and GitHub; benchmarks/load_test.py runs a stand-in.
+IMAGE_HOST = os.environ.get("IMAGE_HOST")
+
+THUMBNAIL_WIDTHS = (160, 320)
+FORMATS = {
+    "webp": ("WEBP", {"quality": 80, "method": 6}),
+    "jpeg": ("JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def _encode(image, width, fmt):
+    from PIL import Image
+
+    save_format, options = FORMATS[fmt]
+    height = round(image.height * width / image.width)
+    thumb = image.convert("RGB").resize((width, height), Image.LANCZOS)
+    buffer = io.BytesIO()
+    thumb.save(buffer, save_format, **options)
+    return buffer.getvalue()
+
+
+def build_thumbnails(widths=THUMBNAIL_WIDTHS, fmt="webp"):
+    """Write thumbnails for every hero with local art and return the manifest."""
+    from hero_images import hero_slug, load_hero_image
+
+    manifest = {"widths": list(widths), "heroes": {}}
+    written = set()
+    for hero in hero_image_urls:
+        image = load_hero_image(hero)
+        if image is None:
+            continue
+        entry = {}
+        for width in widths:
+            data = _encode(image, width, fmt)
+            digest = hashlib.blake2b(data, digest_size=6).hexdigest()
+            relative = f"thumbnails/{width}/{hero_slug(hero)}.{digest}.{fmt}"
+            path = os.path.join(STATIC_DIR, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(data)
+            written.add(os.path.normpath(path))
+            entry[str(width)] = relative
+        manifest["heroes"][hero] = entry
+
+    # Drop thumbnails superseded by a new hash.
+    for width in widths:
+        width_dir = os.path.join(THUMBNAIL_DIR, str(width))
+        for filename in os.listdir(width_dir):
+            path = os.path.normpath(os.path.join(width_dir, filename))
+            if path not in written:
+                os.remove(path)
+
+    with open(MANIFEST_PATH, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def load_manifest(path=MANIFEST_PATH):
+    """The thumbnail manifest, or an empty one if thumbnails were never built."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"widths": [], "heroes": {}}
+
+
+THUMBNAIL_MANIFEST = load_manifest()
+
+# Lays out a tier's <img> tags five to a row; include once per page.
+TIER_GRID_CSS = """
+.tier-grid {
+    display: grid;
+    grid-template-columns: repeat(5, minmax(0, 1fr));
+    gap: 1rem;
+    margin-bottom: 1rem;
+}
+.tier-grid img {
+    width: 100%;
+    height: auto;
+    border-radius: 4px;
+}
+"""
+
+
+def hosted_image_url(url):
+    """https://i.imgur.com/x.jpeg -> <IMAGE_HOST>/i.imgur.com/x.jpeg when IMAGE_HOST is set, else unchanged."""
+    if not IMAGE_HOST:
+        return url
+    parts = urlsplit(url)
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{IMAGE_HOST.rstrip('/')}/{parts.netloc}{parts.path}{query}"
+
+
+def hero_img_tag(hero):
+    """An <img> tag for a hero card, preferring local thumbnails over the hosted image."""
+    alt = html.escape(hero)
+    entry = THUMBNAIL_MANIFEST["heroes"].get(hero)
+    if entry:
+        widths = sorted(entry, key=int)
+        srcset = ", ".join(f"{STATIC_URL}/{entry[w]} {w}w" for w in widths)
+        src = f"{STATIC_URL}/{entry[widths[-1]]}"
+        return f'<img src="{src}" srcset="{srcset}" sizes="(max-width: 640px) 20vw, 140px" alt="{alt}" loading="lazy">'
+    if hero in hero_image_urls:
+        return f'<img src="{html.escape(hosted_image_url(hero_image_urls[hero]))}" alt="{alt}" loading="lazy">'
+    return ""
+
+
+def tier_grid_html(heroes):
+    """One tier's hero cards as a single HTML block."""
+    return f'<div class="tier-grid">{"".join(hero_img_tag(hero) for hero in heroes)}</div>'
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build hero card thumbnails into static/thumbnails.")
+    parser.add_argument("--widths", type=int, nargs="+", default=list(THUMBNAIL_WIDTHS))
+    parser.add_argument("--format", choices=sorted(FORMATS), default="webp")
+    args = parser.parse_args()
+    manifest = build_thumbnails(tuple(args.widths), args.format)
+    print(f"Wrote {len(manifest['heroes'])} heroes x {len(args.widths)} widths to {THUMBNAIL_DIR}")
@@ -0,0 +1,67 @@
+"""
+Whole tier grid composited into a single image.
+
+The card-per-hero grid sends one element per tier plus dozens of image
+requests on every rerun. This mode draws the full S-D grid server-side from
+the local thumbnails and sends it as one image, cached per tier assignment.
+"""
+import functools
+import io
+import os
+
+from thumbnails import STATIC_DIR, THUMBNAIL_MANIFEST
+from tiers import TIERS, TIER_COLORS
+
+CARD_WIDTH = 160
+CARD_HEIGHT = 232
+COLUMNS = 5
+GAP = 8
+LABEL_HEIGHT = 56
+BACKGROUND = (14, 17, 23)
+
+
+@functools.lru_cache(maxsize=None)
+def _card(hero):
+    """A CARD_WIDTH x CARD_HEIGHT card for a hero, or a named placeholder."""
+    from PIL import Image, ImageDraw
+
+    entry = THUMBNAIL_MANIFEST["heroes"].get(hero)
+    if entry and str(CARD_WIDTH) in entry:
+        with Image.open(os.path.join(STATIC_DIR, entry[str(CARD_WIDTH)])) as image:
+            return image.convert("RGB").resize((CARD_WIDTH, CARD_HEIGHT))
+    card = Image.new("RGB", (CARD_WIDTH, CARD_HEIGHT), (45, 48, 56))
+    draw = ImageDraw.Draw(card)
+    draw.multiline_text((CARD_WIDTH / 2, CARD_HEIGHT / 2), hero.replace(" ", "\n"), anchor="mm", align="center", fill="white")
+    return card
+
+
+@functools.lru_cache(maxsize=64)
+def render_tier_grid(tier_members, image_format="WEBP"):
+    """
+    Composite a tier grid into one encoded image.
+
+    `tier_members` is a tuple of hero-name tuples, one per tier in TIERS order,
+    which doubles as the cache key.
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    width = COLUMNS * CARD_WIDTH + (COLUMNS - 1) * GAP
+    row_counts = [max(1, -(-len(members) // COLUMNS)) for members in tier_members]
+    height = sum(LABEL_HEIGHT + rows * (CARD_HEIGHT + GAP) for rows in row_counts)
+
+    canvas = Image.new("RGB", (width, height), BACKGROUND)
+    draw = ImageDraw.Draw(canvas)
+    font = ImageFont.load_default(size=40)
+
+    y = 0
+    for tier, members, rows in zip(TIERS, tier_members, row_counts):
+        draw.text((0, y + LABEL_HEIGHT / 2), tier, font=font, anchor="lm", fill=TIER_COLORS[tier])
+        y += LABEL_HEIGHT
+        for i, hero in enumerate(members):
+            row, col = divmod(i, COLUMNS)
+            canvas.paste(_card(hero), (col * (CARD_WIDTH + GAP), y + row * (CARD_HEIGHT + GAP)))
+        y += rows * (CARD_HEIGHT + GAP)
+
+    buffer = io.BytesIO()
+    canvas.save(buffer, image_format, quality=80)
+    return buffer.getvalue()
@@ -0,0 +1,60 @@
+"""
+Tier assignment for a vector of hero scores.
+
+Tiers are cut at mean +/- 0.5 and 1.5 standard deviations. Every hero is
+bucketed in one np.searchsorted call instead of an if/elif ladder.
+"""
+from typing import NamedTuple
+
+import numpy as np
+
+TIERS = ("S", "A", "B", "C", "D")
+TIER_COLORS = {"S": "red", "A": "orange", "B": "green", "C": "blue", "D": "purple"}
+
+# Offsets from the mean, in standard deviations, of the C, B, A and S cut-offs.
+THRESHOLD_OFFSETS = np.array([-1.5, -0.5, 0.5, 1.5])
+
+
+class TierList(NamedTuple):
+    scores: np.ndarray       # (n_heroes,) score per hero, roster order
+    tier_of: np.ndarray      # (n_heroes,) index into TIERS per hero
+    members: dict            # tier -> hero indices, highest score first
+
+
+def tier_thresholds(scores):
+    """Ascending C/B/A/S cut-offs; a score equal to a cut-off lands in the higher tier."""
+    scores = np.asarray(scores, dtype=np.float64)
+    return scores.mean(axis=-1, keepdims=True) + THRESHOLD_OFFSETS * scores.std(axis=-1, keepdims=True)
+
+
+def bucket_tiers(scores, thresholds):
+    """Map scores to indices into TIERS (0 = S ... 4 = D)."""
+    return len(TIERS) - 1 - np.searchsorted(thresholds, scores, side="right")
+
+
+def tier_indices(scores):
+    """
+    Tier index (0 = S ... 4 = D) of every score in a (..., n_heroes) array,
+    with each row tiered against its own mean and standard deviation.
+    """
+    scores = np.asarray(scores)
+    thresholds = tier_thresholds(scores)
+    return len(TIERS) - 1 - (scores[..., None] >= thresholds[..., None, :]).sum(axis=-1)
+
+
+def assign_tiers(scores):
+    """Bucket a score vector into tiers, returning a TierList."""
+    scores = np.asarray(scores)
+    tier_of = bucket_tiers(scores, tier_thresholds(scores))
+    order = np.argsort(-scores, kind="stable")
+    ordered_tiers = tier_of[order]
+    members = {tier: order[ordered_tiers == t] for t, tier in enumerate(TIERS)}
+    return TierList(scores, tier_of, members)
+
+
+def tier_list_record(tier_list, names):
+    """A TierList as plain JSON-ready data: hero names per tier and scores, best first."""
+    return {
+        "tiers": {tier: [names[i] for i in tier_list.members[tier]] for tier in TIERS},
+        "scores": {names[i]: float(tier_list.scores[i]) for i in np.argsort(-tier_list.scores, kind="stable")},
+    }
@@ -0,0 +1,113 @@
+"""
+Compact, linkable encoding of a session's settings for the page URL.
+
+The weighting (15 slider values in -10..10) is packed as one base-21 integer
+into 9 bytes, 12 base64url characters. Hero edits against the stock roster
+are packed as (row, 15 stats) records, zlib-compressed when that is shorter.
+Each state has exactly one encoding, so the strings double as cache keys.
+"""
+import base64
+import re
+import struct
+import zlib
+
+import numpy as np
+
+from stat_schema import HERO_STAT_RANGE, N_STATS, WEIGHT_RANGE
+
+WEIGHTING_PARAM = "w"
+OVERRIDES_PARAM = "h"
+
+_BASE = WEIGHT_RANGE[1] - WEIGHT_RANGE[0] + 1
+_WEIGHTING_BYTES = (_BASE ** N_STATS - 1).bit_length() // 8 + 1
+_RECORD = struct.Struct(f"<H{N_STATS}b")
+_RAW, _ZLIB = b"\x00", b"\x01"
+_B64URL = re.compile(r"[A-Za-z0-9_-]*")
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text):
+    # The decoder would skip stray characters, giving one state many spellings.
+    if not _B64URL.fullmatch(text):
+        raise ValueError(f"Not base64url: {text!r}")
+    try:
+        return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+    except (ValueError, TypeError) as error:
+        raise ValueError(f"Not base64url: {text!r}") from error
+
+
+def _check_range(values, value_range, what):
+    values = np.asarray(values, dtype=int)
+    if values.shape != (N_STATS,) or values.min() < value_range[0] or values.max() > value_range[1]:
+        raise ValueError(f"{what} must be {N_STATS} integers in {value_range[0]}..{value_range[1]}")
+    return values
+
+
+def encode_weighting(weighting):
+    """12-character base64url string for a weighting."""
+    digits = _check_range(weighting, WEIGHT_RANGE, "A weighting") - WEIGHT_RANGE[0]
+    packed = 0
+    for digit in reversed(digits.tolist()):
+        packed = packed * _BASE + digit
+    return _b64encode(packed.to_bytes(_WEIGHTING_BYTES, "little"))
+
+
+def decode_weighting(text):
+    """Inverse of encode_weighting; raises ValueError on malformed input."""
+    data = _b64decode(text)
+    if len(data) != _WEIGHTING_BYTES:
+        raise ValueError(f"A weighting is {_WEIGHTING_BYTES} bytes, got {len(data)}")
+    packed = int.from_bytes(data, "little")
+    if packed >= _BASE ** N_STATS:
+        raise ValueError("Weighting value out of range")
+    digits = []
+    for _ in range(N_STATS):
+        packed, digit = divmod(packed, _BASE)
+        digits.append(digit)
+    return np.array(digits, dtype=int) + WEIGHT_RANGE[0]
+
+
+def encode_overrides(overrides):
+    """base64url string for {row: stats} hero edits; '' when there are none."""
+    if not overrides:
+        return ""
+    raw = b"".join(
+        _RECORD.pack(int(row), *_check_range(overrides[row], HERO_STAT_RANGE, "Hero stats").tolist())
+        for row in sorted(overrides)
+    )
+    compressed = zlib.compress(raw, 9)
+    return _b64encode(_ZLIB + compressed if len(compressed) < len(raw) else _RAW + raw)
+
+
+def decode_overrides(text, n_heroes):
+    """
+    Inverse of encode_overrides for a roster of `n_heroes` rows; raises
+    ValueError on malformed input or rows outside the roster.
+    """
+    if not text:
+        return {}
+    data = _b64decode(text)
+    kind, raw = data[:1], data[1:]
+    if kind == _ZLIB:
+        try:
+            # Bound the output so a crafted link cannot inflate without limit.
+            raw = zlib.decompressobj().decompress(raw, n_heroes * _RECORD.size + 1)
+        except zlib.error as error:
+            raise ValueError("Corrupt hero edits") from error
+    elif kind != _RAW:
+        raise ValueError("Unknown hero edits encoding")
+    if not raw or len(raw) % _RECORD.size or len(raw) > n_heroes * _RECORD.size:
+        raise ValueError("Hero edits have the wrong length")
+    overrides = {}
+    previous = -1
+    for row, *stats in _RECORD.iter_unpack(raw):
+        if row >= n_heroes:
+            raise ValueError(f"Hero row {row} is outside the roster")
+        if row <= previous:
+            raise ValueError("Hero edits must list each row once, in order")
+        previous = row
+        overrides[row] = _check_range(stats, HERO_STAT_RANGE, "Hero stats").astype(np.int8)
+    return overrides
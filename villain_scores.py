@@ -0,0 +1,37 @@
+"""
+Hero scores against every villain.
+
+Each entry of villain_weights is a 15-stat weighting, so the whole
+heroes x villains score table is one matrix product against the stock
+roster. Switching villains is then a row lookup.
+"""
+import numpy as np
+
+from scoring import HERO_MATRIX, score_heroes
+from tiers import assign_tiers, tier_indices
+from villain_weights import villain_weights
+
+VILLAIN_NAMES = list(villain_weights.keys())
+VILLAIN_MATRIX = np.array([villain_weights[name] for name in VILLAIN_NAMES], dtype=np.int8)
+
+
+def villain_score_matrix(hero_matrix=HERO_MATRIX):
+    """(n_villains, n_heroes) scores, one row per villain in VILLAIN_NAMES order."""
+    return score_heroes(hero_matrix, VILLAIN_MATRIX)
+
+
+def villain_tier_lists(hero_matrix=HERO_MATRIX):
+    """{villain: TierList} for every villain."""
+    return {name: assign_tiers(scores) for name, scores in zip(VILLAIN_NAMES, villain_score_matrix(hero_matrix))}
+
+
+def normalized_score_matrix(hero_matrix=HERO_MATRIX):
+    """Villain scores as z-scores within each villain, so villains are comparable."""
+    scores = villain_score_matrix(hero_matrix).astype(np.float64)
+    std = scores.std(axis=1, keepdims=True)
+    return (scores - scores.mean(axis=1, keepdims=True)) / np.where(std == 0, 1, std)
+
+
+def villain_tier_matrix(hero_matrix=HERO_MATRIX):
+    """(n_villains, n_heroes) tier indices into TIERS."""
+    return tier_indices(villain_score_matrix(hero_matrix))